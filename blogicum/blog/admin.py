@@ -1,9 +1,16 @@
 from django.contrib import admin
 
+from core.writer import SerializedWritesAdminMixin
+
 from .models import Category, Comment, Location, Post
+from .search import match_expression, matching_ids
+
 
+class BlogModelAdmin(SerializedWritesAdminMixin, admin.ModelAdmin):
+    pass
 
-class CategoryAdmin(admin.ModelAdmin):
+
+class CategoryAdmin(BlogModelAdmin):
     list_display = (
         'title',
         'description',
@@ -16,12 +23,13 @@ class CategoryAdmin(admin.ModelAdmin):
     )
 
 
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(BlogModelAdmin):
     list_display = (
         'id',
         'title',
         'text',
         'is_published',
+        'is_visible',
         'category',
         'location',
         'author',
@@ -33,12 +41,18 @@ class PostAdmin(admin.ModelAdmin):
         'category',
         'pub_date',
     )
-    search_fields = ('title',)
-    list_filter = ('is_published',)
+    search_fields = ('title', 'text')
+    list_filter = ('is_published', 'is_visible')
     list_display_links = ('title',)
 
+    def get_search_results(self, request, queryset, search_term):
+        match = match_expression(search_term)
+        if match is None:
+            return queryset, False
+        return queryset.filter(pk__in=matching_ids(match)), False
+
 
 admin.site.register(Post, PostAdmin)
 admin.site.register(Category, CategoryAdmin)
-admin.site.register(Location)
-admin.site.register(Comment)
+admin.site.register(Location, BlogModelAdmin)
+admin.site.register(Comment, BlogModelAdmin)
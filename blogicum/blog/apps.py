@@ -1,7 +1,28 @@
 from django.apps import AppConfig
+from django.db import connections, router
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models.signals import post_migrate
+
+SEARCH_MIGRATION = ('blog', '0023_post_search_index')
+
+
+def restore_search_index(sender, using, **kwargs):
+    """Возвращает триггеры поиска, если миграция 0023 применена."""
+    from blog.search import ensure_search_index
+
+    connection = connections[using]
+    if (router.allow_migrate(using, 'blog', model_name='post')
+            and SEARCH_MIGRATION in MigrationRecorder(
+                connection).applied_migrations()):
+        ensure_search_index(connection)
 
 
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
     verbose_name = 'Блог'
+
+    def ready(self):
+        from blog import signals  # noqa: F401
+
+        post_migrate.connect(restore_search_index, sender=self)
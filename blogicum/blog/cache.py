@@ -0,0 +1,226 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe, quote_etag
+
+from core.conditional import make_etag
+from core.replicas import primary_reads
+
+WRITES_KEY = 'gen:writes'
+PAGE_QUERY_PARAMS = {'page', 'cursor'}
+CARD_HITS_KEY = 'cards:hits'
+CARD_MISSES_KEY = 'cards:misses'
+
+
+def _generation_key(name):
+    return f'gen:{name}'
+
+
+def _generations():
+    """Кеш поколений, общий для всех процессов (CACHES['generations'])."""
+    return caches['generations']
+
+
+def _advance(keys):
+    # Поколение получает новое значение, а не увеличивается на единицу:
+    # incr общего кеша не атомарен, и два процесса могли бы записать одно
+    # и то же число. Значение из текущего времени не совпадёт с прежними,
+    # даже если ключ вытеснили из кеша.
+    _generations().set_many(dict.fromkeys(keys, time.time_ns()), timeout=None)
+
+
+def bump(*names):
+    """Сбрасывает страницы, зависящие от перечисленных поколений.
+
+    Счётчики увеличиваются сразу и ещё раз после коммита, чтобы страница,
+    отрисованная по незакоммиченным данным, не осталась в кеше.
+    """
+    keys = [_generation_key(name) for name in names] + [WRITES_KEY]
+    _advance(keys)
+    transaction.on_commit(lambda: _advance(keys))
+
+
+def get_generations(names):
+    generations = _generations()
+    keys = [_generation_key(name) for name in names]
+    values = generations.get_many(keys)
+    for key in keys:
+        if key not in values:
+            generations.add(key, time.time_ns(), timeout=None)
+            values[key] = generations.get(key)
+    return values
+
+
+def post_dependencies(post):
+    return {f'post:{post.pk}', f'author:{post.author_id}'}
+
+
+def page_dependencies(context):
+    """Поколения, от которых зависит страница с данным контекстом."""
+    names = {'site'}
+    if context.get('category') is not None:
+        names.add(f"category:{context['category'].pk}")
+    if context.get('profile') is not None:
+        names.add(f"author:{context['profile'].pk}")
+    if context.get('post') is not None:
+        names |= post_dependencies(context['post'])
+    for comment in context.get('comments') or ():
+        names.add(f'author:{comment.author_id}')
+    page_obj = context.get('page_obj')
+    if page_obj is not None:
+        if context.get('category') is None and context.get('profile') is None:
+            names.add('feed')
+        for post in page_obj:
+            names |= post_dependencies(post)
+    return names
+
+
+def _is_cacheable_request(request):
+    return (
+        request.method in ('GET', 'HEAD')
+        and set(request.GET) <= PAGE_QUERY_PARAMS
+        and (settings.PAGE_FRAGMENTS == 'esi'
+             or not request.user.is_authenticated)
+    )
+
+
+def _is_public_page(context):
+    """Скрытую публикацию видит только автор: такую страницу не кешируем."""
+    post = context.get('post')
+    return post is None or post.is_visible
+
+
+def _page_key(request):
+    digest = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f'page:{digest}'
+
+
+def _set_validators(request, response, entry):
+    """Валидаторы ответа из общей записи кеша.
+
+    Запись общая для всех пользователей, поэтому в ней лежит тег, не
+    зависящий от пользователя, а ETag строится из него для каждого
+    запроса. В режиме 'esi' в страницу подставляются личные фрагменты,
+    поэтому Last-Modified не отдаётся: по нему другой пользователь
+    получил бы 304 на чужую страницу.
+    """
+    response['ETag'] = quote_etag(make_etag(request, entry['tag']))
+    if settings.PAGE_FRAGMENTS == 'esi':
+        del response['Last-Modified']
+    elif entry['last_modified']:
+        response['Last-Modified'] = entry['last_modified']
+
+
+def cache_anonymous_page(view):
+    """Кеширует страницы для анонимных GET-запросов.
+
+    В режиме PAGE_FRAGMENTS = 'esi' страница не содержит персональных
+    данных и кешируется для всех пользователей.
+
+    Представление должно вернуть TemplateResponse: по его контексту
+    определяется, какие поколения инвалидируют страницу.
+
+    Валидаторы хранятся вместе со страницей, поэтому декоратор ставится
+    над conditional_page: попадание в кеш, в том числе ответ 304,
+    обходится без запросов к базе.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not _is_cacheable_request(request):
+            return view(request, *args, **kwargs)
+        key = _page_key(request)
+        entry = cache.get(key)
+        if entry is not None and (
+                _generations().get_many(list(entry['generations']))
+                == entry['generations']):
+            response = HttpResponse(
+                entry['content'], content_type=entry['content_type'])
+            _set_validators(request, response, entry)
+            response['X-Page-Cache'] = 'hit'
+            return get_conditional_response(
+                request,
+                etag=response.get('ETag'),
+                last_modified=parse_http_date_safe(
+                    response.get('Last-Modified')),
+                response=response,
+            )
+
+        writes = _generations().get(WRITES_KEY)
+        # Кеш наполняется только из основной базы: страница из отстающей
+        # реплики легла бы под уже новое поколение.
+        with primary_reads():
+            response = view(request, *args, **kwargs)
+            context = getattr(response, 'context_data', None)
+            if response.status_code != 200 or context is None:
+                return response
+            response.render()
+        generations = get_generations(page_dependencies(context))
+        if (not response.cookies and _is_public_page(context)
+                and _generations().get(WRITES_KEY) == writes):
+            entry = {
+                'content': response.content,
+                'content_type': response['Content-Type'],
+                'tag': hashlib.md5(response.content).hexdigest(),
+                'last_modified': response.get('Last-Modified'),
+                'generations': generations,
+            }
+            cache.set(key, entry, settings.PAGE_CACHE_TIMEOUT)
+            _set_validators(request, response, entry)
+        response['X-Page-Cache'] = 'miss'
+        return response
+
+    return wrapper
+
+
+def _add_to_counter(key, delta):
+    if delta:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key, delta)
+
+
+def card_key(post):
+    """Ключ карточки меняется вместе с любыми данными, которые она выводит."""
+    version = ':'.join(str(part) for part in (
+        post.updated_at.timestamp(),
+        post.comment_count,
+        post.author.username,
+        post.category and post.category.updated_at.timestamp(),
+        post.location and post.location.updated_at.timestamp(),
+    ))
+    digest = hashlib.md5(version.encode()).hexdigest()
+    return f'card:{post.pk}:{digest}'
+
+
+def render_post_cards(posts):
+    """HTML карточек публикаций; готовые карточки берутся из кеша."""
+    keys = [card_key(post) for post in posts]
+    cards = cache.get_many(keys)
+    prefetch_related_objects(
+        [post for key, post in zip(keys, posts) if key not in cards],
+        'renditions')
+    missing = {
+        key: render_to_string('includes/post_card.html', {'post': post})
+        for key, post in zip(keys, posts)
+        if key not in cards
+    }
+    if missing:
+        cache.set_many(missing, settings.CARD_CACHE_TIMEOUT)
+        cards.update(missing)
+    _add_to_counter(CARD_HITS_KEY, len(keys) - len(missing))
+    _add_to_counter(CARD_MISSES_KEY, len(missing))
+    return [cards[key] for key in keys]
+
+
+def card_cache_stats():
+    return {
+        'hits': cache.get(CARD_HITS_KEY, 0),
+        'misses': cache.get(CARD_MISSES_KEY, 0),
+    }
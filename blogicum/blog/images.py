@@ -0,0 +1,50 @@
+import math
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image
+
+OUTPUT_FORMATS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp'}
+# Из этих форматов дополнительно создаются копии в WebP.
+TRANSCODED_FORMATS = {'JPEG', 'PNG'}
+WEBP = 'image/webp'
+
+
+def rendition_sizes():
+    """Имена и ширины производных картинок, включая варианты 2x."""
+    for name, width in settings.POST_IMAGE_RENDITIONS.items():
+        yield name, width
+        yield f'{name}_2x', width * 2
+
+
+def encode_image(image, image_format):
+    """Байты картинки, расширение и MIME-тип; метаданные EXIF не пишутся."""
+    if image_format not in OUTPUT_FORMATS:
+        image_format = 'PNG'
+    if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    elif image_format == 'WEBP' and image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA')
+    buffer = BytesIO()
+    image.save(buffer, image_format, quality=85, optimize=True)
+    return (buffer.getvalue(), OUTPUT_FORMATS[image_format],
+            Image.MIME[image_format])
+
+
+def fit_pixel_budget(field_file):
+    """Уменьшает ещё не сохранённую загрузку до POST_IMAGE_PIXEL_BUDGET."""
+    with Image.open(field_file) as image:
+        image_format = image.format
+        pixels = image.width * image.height
+        if (pixels <= settings.POST_IMAGE_PIXEL_BUDGET
+                or getattr(image, 'is_animated', False)):
+            field_file.seek(0)
+            return
+        scale = math.sqrt(settings.POST_IMAGE_PIXEL_BUDGET / pixels)
+        image.thumbnail((int(image.width * scale), int(image.height * scale)))
+        data, extension, _ = encode_image(image, image_format)
+    stem = os.path.splitext(os.path.basename(field_file.name))[0]
+    field_file.file = ContentFile(data, name=f'{stem}.{extension}')
+    field_file.name = f'{stem}.{extension}'
@@ -0,0 +1,176 @@
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from core.sqlite import SQLITE_PROFILES
+from core.writer import write_queue
+
+from blog.models import Category, Location, Post, User
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+@contextmanager
+def scratch_database(path):
+    """Переключает соединения по умолчанию на временный файл базы."""
+    original = connection.settings_dict['NAME']
+    connection.close()
+    connection.settings_dict['NAME'] = path
+    try:
+        call_command('migrate', verbosity=0)
+        yield
+    finally:
+        connection.close()
+        connection.settings_dict['NAME'] = original
+
+
+def seed(posts, users):
+    now = timezone.now()
+    category = Category.objects.create(
+        title='Нагрузка', description='Нагрузка', slug='bench')
+    location = Location.objects.create(name='Нагрузка')
+    authors = [
+        User.objects.create_user(username=f'bench{index}')
+        for index in range(users)
+    ]
+    post_ids = [
+        Post.objects.create(
+            title=f'Публикация {index}', text='Текст ' * 200,
+            pub_date=now, author=authors[index % users],
+            category=category, location=location,
+        ).pk
+        for index in range(posts)
+    ]
+    return authors, post_ids
+
+
+class Command(BaseCommand):
+    help = ('Нагрузочный тест SQLite: параллельные чтения страниц и '
+            'комментарии через представления блога для каждого профиля '
+            'SQLITE_PROFILES. Работает на временной базе.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profiles', nargs='+', choices=sorted(SQLITE_PROFILES),
+            default=sorted(SQLITE_PROFILES),
+            help='Какие профили сравнивать.')
+        parser.add_argument(
+            '--readers', type=int, default=6,
+            help='Число потоков, читающих страницы.')
+        parser.add_argument(
+            '--writers', type=int, default=2,
+            help='Число потоков, пишущих комментарии.')
+        parser.add_argument(
+            '--duration', type=float, default=10,
+            help='Длительность замера для профиля, секунд.')
+        parser.add_argument(
+            '--posts', type=int, default=50,
+            help='Сколько публикаций создать перед замером.')
+        parser.add_argument(
+            '--write-queue', dest='queue_mode', default='off',
+            choices=('off', 'on', 'both'),
+            help='Пропускать записи через поток-писатель (SERIALIZE_WRITES);'
+                 ' both — замерить оба варианта.')
+
+    def handle(self, *args, profiles, readers, writers, duration, posts,
+               queue_mode, **options):
+        modes = {'off': [False], 'on': [True], 'both': [False, True]}
+        request_logger = logging.getLogger('django.request')
+        level = request_logger.level
+        request_logger.setLevel(logging.CRITICAL)
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                for profile in profiles:
+                    for serialize in modes[queue_mode]:
+                        label = f'{profile}+writer' if serialize else profile
+                        path = os.path.join(directory, f'{label}.sqlite3')
+                        with override_settings(SQLITE_PROFILE=profile,
+                                               SERIALIZE_WRITES=serialize), \
+                                scratch_database(path):
+                            self.report(label, self.run(
+                                readers, writers, duration, posts), duration)
+        finally:
+            request_logger.setLevel(level)
+
+    def run(self, readers, writers, duration, posts):
+        users, post_ids = seed(posts, readers + writers)
+        connection.close()
+        stop = threading.Event()
+        results = []
+        threads = [
+            threading.Thread(
+                target=self.worker,
+                args=(user, post_ids, index < writers, stop, results))
+            for index, user in enumerate(users)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        write_queue.stop()
+        return results
+
+    def request(self, client, post_id, writer):
+        if writer:
+            return client.post(
+                f'/posts/{post_id}/comment/', {'text': 'Нагрузка'})
+        if random.random() < 0.5:
+            return client.get('/')
+        return client.get(f'/posts/{post_id}/')
+
+    def worker(self, user, post_ids, writer, stop, results):
+        # Исключения чужих потоков иначе приходят и в этот клиент.
+        client = Client(SERVER_NAME='localhost', raise_request_exception=False)
+        client.force_login(user)
+        latencies = []
+        errors = 0
+        try:
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    response = self.request(
+                        client, random.choice(post_ids), writer)
+                    failed = response.status_code >= 400
+                except Exception:
+                    failed = True
+                if failed:
+                    errors += 1
+                else:
+                    latencies.append(time.perf_counter() - started)
+        finally:
+            connection.close()
+            results.append((writer, latencies, errors))
+
+    def report(self, profile, results, duration):
+        for writer, title in ((False, 'чтение'), (True, 'запись')):
+            latencies = [
+                value for is_writer, values, _ in results
+                if is_writer == writer for value in values
+            ]
+            errors = sum(
+                count for is_writer, _, count in results
+                if is_writer == writer)
+            self.stdout.write(
+                f'{profile:>18} {title:>7}: '
+                f'{len(latencies) / duration:8.1f} запр/с, '
+                f'p50 {percentile(latencies, 0.5) * 1000:7.1f} мс, '
+                f'p99 {percentile(latencies, 0.99) * 1000:7.1f} мс, '
+                f'ошибок {errors}')
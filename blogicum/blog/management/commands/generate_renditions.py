@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.renditions import generate_renditions
+
+
+class Command(BaseCommand):
+    help = 'Создаёт недостающие и устаревшие размеры картинок публикаций.'
+
+    def handle(self, *args, **options):
+        updated = 0
+        posts = Post.objects.exclude(image='').only('id', 'image')
+        for post in posts.iterator():
+            updated += generate_renditions(post)
+        self.stdout.write(f'Обновлено публикаций: {updated}')
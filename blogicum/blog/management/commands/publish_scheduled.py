@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.cache import bump
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = ('Открывает отложенные публикации, время которых наступило. '
+            'Запускается периодически (cron) или с --interval.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Повторять каждые N секунд вместо однократного запуска.')
+
+    def handle(self, *args, interval=0, **options):
+        while True:
+            published = Post.objects.publish_due()
+            if published:
+                bump('site')
+            self.stdout.write(f'Опубликовано: {published}')
+            if not interval:
+                break
+            time.sleep(interval)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import AuthorStats
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает статистику авторов и исправляет расхождения.'
+
+    def handle(self, *args, **options):
+        repaired = AuthorStats.objects.recount()
+        self.stdout.write(f'Исправлено авторов: {repaired}')
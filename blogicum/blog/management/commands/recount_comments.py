@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает Post.comment_count и исправляет расхождения.'
+
+    def handle(self, *args, **options):
+        # Два запроса вместо подзапроса: комментарии могут лежать
+        # в другой базе (COMMENTS_DATABASE).
+        actual = dict(
+            Comment.objects.order_by().values_list('post_id')
+            .annotate(total=Count('pk'))
+        )
+        repaired = 0
+        posts = Post.objects.values_list('pk', 'comment_count')
+        for pk, count in posts.iterator():
+            if count != actual.get(pk, 0):
+                Post.objects.filter(pk=pk).update(
+                    comment_count=actual.get(pk, 0))
+                repaired += 1
+        self.stdout.write(f'Исправлено публикаций: {repaired}')
@@ -0,0 +1,104 @@
+import heapq
+import os
+import shutil
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.models import StoredFile
+from core.storage import post_image_storage
+
+from blog.models import ImageRendition, Post
+
+MEDIA_DIRECTORY = 'post_images'
+
+
+def walk_sorted(root, directory):
+    """Файлы дерева в порядке сортировки имён.
+
+    В памяти держится только содержимое текущих каталогов; каталог "a"
+    сортируется как "a/", чтобы "a.jpg" шёл раньше "a/b.jpg".
+    """
+    path = os.path.join(root, directory)
+    try:
+        entries = list(os.scandir(path))
+    except FileNotFoundError:
+        return
+    entries.sort(
+        key=lambda entry: entry.name + (
+            '/' if entry.is_dir(follow_symlinks=False) else ''))
+    for entry in entries:
+        name = f'{directory}/{entry.name}'
+        if entry.is_dir(follow_symlinks=False):
+            yield from walk_sorted(root, name)
+        elif entry.is_file(follow_symlinks=False):
+            yield name, entry.stat()
+
+
+def referenced_names(batch_size):
+    """Отсортированный поток имён файлов, на которые ссылается база."""
+    streams = [
+        model.objects.exclude(image='').order_by('image')
+        .values_list('image', flat=True).iterator(chunk_size=batch_size)
+        for model in (Post, ImageRendition)
+    ]
+    previous = None
+    for name in heapq.merge(*streams):
+        if name != previous:
+            yield name
+            previous = name
+
+
+def orphans(files, references):
+    """Разность двух отсортированных потоков: файлы без ссылок."""
+    reference = next(references, None)
+    for name, stat in files:
+        while reference is not None and reference < name:
+            reference = next(references, None)
+        if name != reference:
+            yield name, stat
+
+
+class Command(BaseCommand):
+    help = ('Удаляет или переносит в карантин файлы картинок, '
+            'на которые не ссылается ни одна публикация.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=2000,
+            help='Сколько имён читать из базы за один запрос.')
+        parser.add_argument(
+            '--min-age', type=int, default=60 * 60,
+            help='Не трогать файлы моложе N секунд: их транзакция '
+                 'могла ещё не завершиться.')
+        parser.add_argument(
+            '--quarantine', metavar='DIR',
+            help='Переносить файлы в каталог DIR вместо удаления.')
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать, что было бы удалено.')
+
+    def handle(self, *args, batch_size, min_age, quarantine, dry_run,
+               **options):
+        root = post_image_storage.location
+        deadline = time.time() - min_age
+        found = reclaimed = 0
+        files = walk_sorted(root, MEDIA_DIRECTORY)
+        for name, stat in orphans(files, referenced_names(batch_size)):
+            if stat.st_mtime > deadline:
+                continue
+            found += 1
+            reclaimed += stat.st_size
+            self.stdout.write(f'{name} ({stat.st_size} байт)')
+            if dry_run:
+                continue
+            path = os.path.join(root, name)
+            if quarantine:
+                target = os.path.join(quarantine, name)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.move(path, target)
+            else:
+                os.remove(path)
+            StoredFile.objects.filter(name=name).delete()
+        action = 'Найдено' if dry_run else 'Освобождено'
+        self.stdout.write(f'{action}: {found} файлов, {reclaimed} байт')
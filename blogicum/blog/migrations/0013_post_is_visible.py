@@ -0,0 +1,29 @@
+# Generated by Django 3.2.16 on 2026-10-18 01:39
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_is_visible(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Post.objects.filter(
+        is_published=True,
+        category__is_published=True,
+        pub_date__lte=timezone.now(),
+    ).update(is_visible=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_comment_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='is_visible',
+            field=models.BooleanField(db_index=True, default=False, editable=False, verbose_name='Видна читателям'),
+        ),
+        migrations.RunPython(fill_is_visible, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 3.2.16 on 2026-10-18 01:50
+
+from django.db import migrations, models
+from django.template.defaultfilters import linebreaksbr
+from django.utils.text import Truncator
+
+# Копия blog.text на момент миграции: правки в нём не должны менять
+# то, что заполняет уже написанная миграция.
+EXCERPT_WORDS = 10
+EXCERPT_MAX_LENGTH = 512
+
+
+def fill_rendered_text(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    for post in Post.objects.only('text').iterator():
+        excerpt = Truncator(post.text).words(EXCERPT_WORDS, truncate=' …')
+        Post.objects.filter(pk=post.pk).update(
+            excerpt=excerpt[:EXCERPT_MAX_LENGTH],
+            text_html=str(linebreaksbr(post.text, autoescape=True)),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_author_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=512, verbose_name='Начало текста'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='Текст в HTML'),
+        ),
+        migrations.RunPython(fill_rendered_text, migrations.RunPython.noop),
+    ]
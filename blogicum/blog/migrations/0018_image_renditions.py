@@ -0,0 +1,34 @@
+# Generated by Django 3.2.16 on 2026-10-18 01:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0017_post_rendered_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageRendition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=32, verbose_name='Размер')),
+                ('image', models.ImageField(upload_to='post_images/renditions', verbose_name='Картинка')),
+                ('width', models.PositiveIntegerField(verbose_name='Ширина')),
+                ('height', models.PositiveIntegerField(verbose_name='Высота')),
+                ('source', models.CharField(max_length=255, verbose_name='Исходный файл')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='renditions', to='blog.post', verbose_name='Публикация')),
+            ],
+            options={
+                'verbose_name': 'размер картинки',
+                'verbose_name_plural': 'Размеры картинок',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='imagerendition',
+            constraint=models.UniqueConstraint(fields=('post', 'name'), name='rendition_post_name_uniq'),
+        ),
+    ]
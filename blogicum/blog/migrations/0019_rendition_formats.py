@@ -0,0 +1,38 @@
+# Generated by Django 3.2.16 on 2026-10-18 01:56
+
+import mimetypes
+
+from django.db import migrations, models
+
+
+def fill_mime_type(apps, schema_editor):
+    ImageRendition = apps.get_model('blog', 'ImageRendition')
+    for rendition in ImageRendition.objects.only('image').iterator():
+        mime_type, _ = mimetypes.guess_type(rendition.image.name)
+        ImageRendition.objects.filter(pk=rendition.pk).update(
+            mime_type=mime_type or '')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0018_image_renditions'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='imagerendition',
+            name='rendition_post_name_uniq',
+        ),
+        migrations.AddField(
+            model_name='imagerendition',
+            name='mime_type',
+            field=models.CharField(default='image/jpeg', max_length=32, verbose_name='Формат'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_mime_type, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='imagerendition',
+            constraint=models.UniqueConstraint(fields=('post', 'name', 'mime_type'), name='rendition_post_name_type_uniq'),
+        ),
+    ]
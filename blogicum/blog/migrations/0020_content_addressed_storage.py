@@ -0,0 +1,24 @@
+# Generated by Django 3.2.16 on 2026-10-18 01:57
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0019_rendition_formats'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='imagerendition',
+            name='image',
+            field=models.ImageField(storage=core.storage.ContentAddressedStorage(), upload_to='post_images/renditions', verbose_name='Картинка'),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, storage=core.storage.ContentAddressedStorage(), upload_to='post_images', verbose_name='Фото'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+from django.db import migrations
+
+# SQL зафиксирован здесь, а не берётся из blog.search: исторические
+# миграции не должны меняться вместе с кодом приложения.
+CREATE_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS blog_post_fts "
+    "USING fts5(title, text, content='blog_post', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    '''CREATE TRIGGER IF NOT EXISTS blog_post_fts_insert
+        AFTER INSERT ON blog_post BEGIN
+            INSERT INTO blog_post_fts(rowid, title, text)
+            VALUES (new.id, new.title, new.text);
+        END''',
+    '''CREATE TRIGGER IF NOT EXISTS blog_post_fts_delete
+        AFTER DELETE ON blog_post BEGIN
+            INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text)
+            VALUES ('delete', old.id, old.title, old.text);
+        END''',
+    '''CREATE TRIGGER IF NOT EXISTS blog_post_fts_update
+        AFTER UPDATE OF title, text ON blog_post BEGIN
+            INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text)
+            VALUES ('delete', old.id, old.title, old.text);
+            INSERT INTO blog_post_fts(rowid, title, text)
+            VALUES (new.id, new.title, new.text);
+        END''',
+    "INSERT INTO blog_post_fts(blog_post_fts) VALUES ('rebuild')",
+)
+DROP_SQL = (
+    'DROP TRIGGER IF EXISTS blog_post_fts_insert',
+    'DROP TRIGGER IF EXISTS blog_post_fts_delete',
+    'DROP TRIGGER IF EXISTS blog_post_fts_update',
+    'DROP TABLE IF EXISTS blog_post_fts',
+)
+
+
+def run_sqlite(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0022_comment_cross_database'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_sqlite(CREATE_SQL), run_sqlite(DROP_SQL),
+            hints={'model_name': 'post'}),
+    ]
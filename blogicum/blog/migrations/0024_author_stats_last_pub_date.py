@@ -0,0 +1,25 @@
+# Generated by Django 3.2.16 on 2026-10-18 09:12
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def fill_last_pub_date(apps, schema_editor):
+    AuthorStats = apps.get_model('blog', 'AuthorStats')
+    Post = apps.get_model('blog', 'Post')
+    AuthorStats.objects.update(last_post_at=Subquery(
+        Post.objects.filter(author_id=OuterRef('author_id'))
+        .order_by('-pub_date').values('pub_date')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0023_post_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            fill_last_pub_date, migrations.RunPython.noop,
+            hints={'model_name': 'authorstats'}),
+    ]
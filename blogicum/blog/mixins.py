@@ -3,11 +3,26 @@ from django.urls import reverse
 
 from blog.forms import CommentForm
 from blog.models import Comment
+from blog.paginators import paginate
+from blog.references import attach_references
 
 
 class DispatchMixin:
+    """Пускает к объекту только автора.
+
+    Объект загружается один раз: проверка прав и UpdateView/DeleteView
+    получают его из одного запроса.
+    """
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+
     def dispatch(self, request, *args, **kwargs):
-        if (self.get_object().author != request.user):
+        if self.get_object().author_id != request.user.id:
             return redirect('blog:post_detail', pk=kwargs['pk'])
         return super().dispatch(request, *args, **kwargs)
 
@@ -19,3 +34,10 @@ class CommentMixin:
 
     def get_success_url(self):
         return reverse('blog:post_detail', kwargs={'pk': self.kwargs['pk']})
+
+
+class KeysetPaginationMixin:
+    def paginate_queryset(self, queryset, page_size):
+        page = paginate(self.request, queryset, page_size)
+        page.object_list = attach_references(page.object_list)
+        return page.paginator, page, page.object_list, page.has_other_pages()
@@ -1,7 +1,15 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import (Case, Count, F, Max, Q, Subquery, Value,
+                              When)
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
 
 from core.models import BaseModel
+from core.storage import post_image_storage
+
+from blog.images import fit_pixel_budget
+from blog.text import EXCERPT_MAX_LENGTH, make_excerpt, render_text
 
 User = get_user_model()
 
@@ -42,6 +50,30 @@ class Location(BaseModel):
         return self.name
 
 
+class PostQuerySet(models.QuerySet):
+    def visible(self):
+        return self.filter(is_visible=True)
+
+    def sync_visibility(self, category):
+        """Пересчитывает is_visible у публикаций категории одним UPDATE."""
+        if category is None or not category.is_published:
+            return self.update(is_visible=False)
+        return self.update(is_visible=Case(
+            When(is_published=True, pub_date__lte=timezone.now(),
+                 then=Value(True)),
+            default=Value(False),
+        ))
+
+    def publish_due(self):
+        """Открывает отложенные публикации, время которых наступило."""
+        return self.filter(
+            is_visible=False,
+            is_published=True,
+            category__is_published=True,
+            pub_date__lte=timezone.now(),
+        ).update(is_visible=True)
+
+
 class Post(BaseModel):
     title = models.CharField(
         max_length=256,
@@ -50,9 +82,21 @@ class Post(BaseModel):
     image = models.ImageField(
         verbose_name='Фото',
         blank=True,
-        upload_to='post_images'
+        upload_to='post_images',
+        storage=post_image_storage
     )
     text = models.TextField(verbose_name='Текст')
+    excerpt = models.CharField(
+        max_length=EXCERPT_MAX_LENGTH,
+        blank=True,
+        editable=False,
+        verbose_name='Начало текста'
+    )
+    text_html = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Текст в HTML'
+    )
     pub_date = models.DateTimeField(
         verbose_name='Дата и время публикации',
         help_text=("Если установить дату и время в будущем"
@@ -79,25 +123,70 @@ class Post(BaseModel):
         verbose_name='Категория',
         related_name='posts'
     )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
+    is_visible = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Видна читателям'
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
+        indexes = (
+            models.Index(fields=('-pub_date', '-id'),
+                         condition=models.Q(is_visible=True),
+                         name='post_visible_feed_idx'),
+            models.Index(fields=('category', '-pub_date', '-id'),
+                         condition=models.Q(is_visible=True),
+                         name='post_category_feed_idx'),
+            models.Index(fields=('author', '-pub_date', '-id'),
+                         name='post_author_feed_idx'),
+        )
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        self.is_visible = bool(
+            self.is_published
+            and self.category is not None
+            and self.category.is_published
+            and self.pub_date <= timezone.now()
+        )
+        if self.image and not self.image._committed:
+            fit_pixel_budget(self.image)
+        derived = {'is_visible'}
+        if 'text' not in self.get_deferred_fields():
+            self.excerpt = make_excerpt(self.text)
+            self.text_html = render_text(self.text)
+            derived |= {'excerpt', 'text_html'}
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, *derived}
+        super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
+    # Комментарии могут храниться в отдельной базе COMMENTS_DATABASE,
+    # поэтому ссылки без ограничений в БД, а каскад — в blog.signals.
     text = models.TextField(verbose_name='Текст комментария')
     post = models.ForeignKey(
         Post,
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
     )
     created_at = models.DateTimeField(auto_now_add=True)
     author = models.ForeignKey(
         User,
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
         related_name='comments',
     )
 
@@ -105,6 +194,186 @@ class Comment(models.Model):
         ordering = ('created_at',)
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = (
+            models.Index(fields=('post', 'created_at'),
+                         name='comment_post_created_idx'),
+        )
 
     def __str__(self):
         return f'Комментарий автора {self.author} к посту {self.post}'
+
+
+class ImageRendition(models.Model):
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='renditions',
+        verbose_name='Публикация'
+    )
+    name = models.CharField(max_length=32, verbose_name='Размер')
+    mime_type = models.CharField(max_length=32, verbose_name='Формат')
+    image = models.ImageField(
+        upload_to='post_images/renditions',
+        storage=post_image_storage,
+        verbose_name='Картинка'
+    )
+    width = models.PositiveIntegerField(verbose_name='Ширина')
+    height = models.PositiveIntegerField(verbose_name='Высота')
+    source = models.CharField(
+        max_length=255,
+        verbose_name='Исходный файл'
+    )
+
+    class Meta:
+        verbose_name = 'размер картинки'
+        verbose_name_plural = 'Размеры картинок'
+        constraints = (
+            models.UniqueConstraint(fields=('post', 'name', 'mime_type'),
+                                    name='rendition_post_name_type_uniq'),
+        )
+
+    def __str__(self):
+        return (f'{self.name} {self.mime_type} '
+                f'{self.width}×{self.height} ({self.source})')
+
+
+class AuthorStatsQuerySet(models.QuerySet):
+    def _compute(self, author_id):
+        values = Post.objects.filter(author_id=author_id).aggregate(
+            post_count=Count('pk'),
+            published_count=Count('pk', filter=Q(is_published=True)),
+            last_post_at=Max('pub_date'),
+        )
+        values['comment_count'] = Comment.objects.filter(
+            author_id=author_id).count()
+        return values
+
+    def recount(self):
+        """Пересчитывает статистику целиком; возвращает число исправлений."""
+        repaired = 0
+        for stats in self.iterator():
+            actual = self._compute(stats.author_id)
+            if any(getattr(stats, field) != value
+                   for field, value in actual.items()):
+                self.filter(pk=stats.pk).update(**actual)
+                repaired += 1
+        return repaired
+
+    def for_author(self, author):
+        """Статистика автора; строка создаётся при первом обращении."""
+        stats = self.filter(author=author).first()
+        if stats is None:
+            stats, _ = self.get_or_create(
+                author=author, defaults=self._compute(author.pk))
+        return stats
+
+    @staticmethod
+    def _latest_pub_date(author_id):
+        return Subquery(
+            Post.objects.filter(author_id=author_id)
+            .order_by('-pub_date').values('pub_date')[:1])
+
+    def post_saved(self, post, previous=None):
+        """Учитывает сохранение публикации одним UPDATE.
+
+        previous — прежнее состояние изменённой публикации; None для новой.
+        """
+        if previous is not None and previous.author_id != post.author_id:
+            self.post_deleted(previous)
+            previous = None
+        changes = {}
+        if previous is None:
+            changes['post_count'] = F('post_count') + 1
+        published = int(post.is_published) - int(
+            previous is not None and previous.is_published)
+        if published:
+            changes['published_count'] = F('published_count') + published
+        if previous is None or post.pub_date > previous.pub_date:
+            pub_date = Value(post.pub_date)
+            changes['last_post_at'] = Greatest(
+                Coalesce('last_post_at', pub_date), pub_date)
+        elif post.pub_date < previous.pub_date:
+            changes['last_post_at'] = self._latest_pub_date(post.author_id)
+        if changes:
+            self.filter(author_id=post.author_id).update(**changes)
+
+    def post_deleted(self, post):
+        """Учитывает удаление публикации одним UPDATE."""
+        self.filter(author_id=post.author_id).update(
+            post_count=F('post_count') - 1,
+            published_count=F('published_count') - int(post.is_published),
+            last_post_at=Case(
+                When(last_post_at__lte=post.pub_date,
+                     then=self._latest_pub_date(post.author_id)),
+                default=F('last_post_at'),
+            ),
+        )
+
+    def comment_added(self, comment):
+        self.filter(author_id=comment.author_id).update(
+            comment_count=F('comment_count') + 1)
+
+    def comment_deleted(self, comment):
+        self.filter(author_id=comment.author_id, comment_count__gt=0).update(
+            comment_count=F('comment_count') - 1)
+
+
+class AuthorStats(models.Model):
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Автор'
+    )
+    post_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Публикаций'
+    )
+    published_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Опубликовано'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Комментариев'
+    )
+    last_post_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Последняя публикация'
+    )
+
+    objects = AuthorStatsQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'статистика автора'
+        verbose_name_plural = 'Статистика авторов'
+
+    def __str__(self):
+        return f'Статистика автора {self.author_id}'
+
+
+class CommentNotification(models.Model):
+    """Ожидающее уведомление автору о новом комментарии."""
+
+    recipient = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Получатель'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Публикация'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'уведомление о комментарии'
+        verbose_name_plural = 'Уведомления о комментариях'
+
+    def __str__(self):
+        return f'Уведомление {self.recipient_id} о посте {self.post_id}'
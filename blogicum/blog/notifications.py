@@ -0,0 +1,58 @@
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Count, Max
+from django.template.loader import render_to_string
+
+from jobs.queue import enqueue
+
+from blog.models import CommentNotification
+
+DIGEST_TASK = 'blog.send_comment_digests'
+DIGEST_SUBJECT = 'Новые комментарии к вашим публикациям'
+
+
+def notify_post_author(comment, post):
+    """Откладывает уведомление автору публикации до ближайшей сводки."""
+    if comment.author_id == post.author_id:
+        return
+    CommentNotification.objects.create(
+        recipient_id=post.author_id, post_id=post.pk)
+    enqueue(DIGEST_TASK, delay=settings.COMMENT_DIGEST_WINDOW,
+            dedupe_key=DIGEST_TASK)
+
+
+def send_comment_digests():
+    """Отправляет каждому автору одно письмо по всем ожидающим уведомлениям.
+
+    Уведомления сворачиваются одним запросом с группировкой по автору и
+    публикации. Возвращает число отправленных сводок.
+    """
+    with transaction.atomic():
+        last_id = CommentNotification.objects.aggregate(
+            last_id=Max('pk'))['last_id']
+        if last_id is None:
+            return 0
+        pending = CommentNotification.objects.filter(pk__lte=last_id)
+        rows = pending.exclude(recipient__email='').values(
+            'recipient_id', 'recipient__email', 'post_id', 'post__title',
+        ).annotate(
+            comments=Count('pk'), last_at=Max('created_at'),
+        ).order_by('recipient_id', 'post_id')
+        messages = [
+            EmailMessage(
+                subject=DIGEST_SUBJECT,
+                body=render_to_string(
+                    'blog/comment_digest.txt', {'posts': list(posts)}),
+                to=[email],
+            )
+            for (_, email), posts in groupby(
+                rows, key=itemgetter('recipient_id', 'recipient__email'))
+        ]
+        if messages:
+            get_connection().send_messages(messages)
+        pending.delete()
+    return len(messages)
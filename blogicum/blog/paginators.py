@@ -0,0 +1,192 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.paginator import InvalidPage, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+MAX_PAGE_DEPTH = 50
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """Сохраняет микросекунды: DjangoJSONEncoder обрезает их до миллисекунд."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values, direction):
+    payload = json.dumps({'v': values, 'd': direction}, cls=CursorEncoder)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return payload['v'], payload['d']
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise InvalidPage('Некорректный курсор страницы.')
+
+
+class CappedPaginator(Paginator):
+    """Нумерованная пагинация, ограниченная первыми max_pages страницами."""
+
+    def __init__(self, *args, max_pages=MAX_PAGE_DEPTH, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_pages = max_pages
+
+    @cached_property
+    def count(self):
+        return self.object_list[:self.max_pages * self.per_page].count()
+
+
+class KeysetPage:
+    is_cursor = True
+
+    def __init__(self, object_list, paginator,
+                 next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<KeysetPage of {len(self)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Общая часть пагинации по курсору.
+
+    Подкласс выбирает per_page + 1 строк после ключа (_fetch), разбирает
+    ключ из курсора (_parse_key), строит ключ строки (_key) и при
+    необходимости превращает строки в объекты страницы (_objects).
+    """
+
+    def __init__(self, per_page):
+        self.per_page = int(per_page)
+
+    def _parse_key(self, values):
+        raise NotImplementedError
+
+    def _fetch(self, key, forward):
+        raise NotImplementedError
+
+    def _key(self, row):
+        raise NotImplementedError
+
+    def _objects(self, rows):
+        return rows
+
+    def page(self, cursor=None):
+        forward, key = True, None
+        if cursor:
+            values, direction = decode_cursor(cursor)
+            forward = direction != 'prev'
+            key = self._parse_key(values)
+        rows = list(self._fetch(key, forward))
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if forward:
+            has_next, has_previous = has_more, bool(cursor)
+        else:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        return KeysetPage(
+            self._objects(rows),
+            self,
+            next_cursor=(encode_cursor(self._key(rows[-1]), 'next')
+                         if has_next and rows else None),
+            previous_cursor=(encode_cursor(self._key(rows[0]), 'prev')
+                             if has_previous and rows else None),
+        )
+
+
+class KeysetPaginator(CursorPaginator):
+    """Пагинация по ключу сортировки вместо OFFSET.
+
+    Ключ берётся из order_by() переданного queryset; последнее поле
+    сортировки должно быть уникальным (обычно id).
+    """
+
+    def __init__(self, object_list, per_page):
+        super().__init__(per_page)
+        self.object_list = object_list
+        self.ordering = [
+            (name.lstrip('-'), name.startswith('-'))
+            for name in object_list.query.order_by
+        ]
+        if not self.ordering:
+            raise ValueError('KeysetPaginator требует упорядоченный queryset.')
+
+    def _key(self, obj):
+        return [getattr(obj, name) for name, _ in self.ordering]
+
+    def _parse_key(self, values):
+        if len(values) != len(self.ordering):
+            raise InvalidPage('Некорректный курсор страницы.')
+        opts = self.object_list.model._meta
+        try:
+            return [
+                opts.get_field(name).to_python(value)
+                for (name, _), value in zip(self.ordering, values)
+            ]
+        except Exception:
+            raise InvalidPage('Некорректный курсор страницы.')
+
+    def _seek(self, values, forward):
+        condition = Q()
+        equal = {}
+        for (name, descending), value in zip(self.ordering, values):
+            lookup = 'lt' if descending == forward else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+    def _order(self, forward):
+        return [
+            f'-{name}' if descending == forward else name
+            for name, descending in self.ordering
+        ]
+
+    def _fetch(self, key, forward):
+        queryset = self.object_list
+        if key is not None:
+            queryset = queryset.filter(self._seek(key, forward))
+        return queryset.order_by(*self._order(forward))[:self.per_page + 1]
+
+
+def paginate(request, queryset, per_page):
+    """Страница по ?cursor=, либо по ?page= не глубже MAX_PAGE_DEPTH."""
+    cursor = request.GET.get('cursor')
+    page_number = request.GET.get('page')
+    try:
+        if page_number is not None and cursor is None:
+            return CappedPaginator(queryset, per_page).page(page_number)
+        return KeysetPaginator(queryset, per_page).page(cursor)
+    except InvalidPage:
+        raise Http404('Страница не найдена.')
@@ -0,0 +1,96 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+from blog.cache import get_generations
+from blog.models import Category, Location, User
+
+REFERENCE_GENERATION = 'reference'
+
+
+class ReferenceCache:
+    """Копия справочной таблицы в памяти процесса.
+
+    Хранит не больше REFERENCE_CACHE_SIZE последних использованных строк
+    и сбрасывается, когда меняется поколение REFERENCE_GENERATION. Оно
+    лежит в общем кеше CACHES['generations'], поэтому изменение справочника
+    в одном процессе сбрасывает копии во всех остальных.
+    """
+
+    def __init__(self, model, field='pk'):
+        self.model = model
+        self.field = field
+        self._items = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _current_version(self):
+        generations = get_generations([REFERENCE_GENERATION])
+        return next(iter(generations.values()))
+
+    def get_many(self, keys):
+        keys = set(keys)
+        version = self._current_version()
+        found = {}
+        with self._lock:
+            if version != self._version:
+                self._items.clear()
+                self._version = version
+            for key in keys & self._items.keys():
+                self._items.move_to_end(key)
+                found[key] = self._items[key]
+        missing = keys - found.keys()
+        if missing:
+            loaded = {
+                getattr(obj, self.field): obj
+                for obj in self.model.objects.filter(
+                    **{f'{self.field}__in': missing})
+            }
+            with self._lock:
+                if version == self._version:
+                    self._items.update(loaded)
+                    while len(self._items) > settings.REFERENCE_CACHE_SIZE:
+                        self._items.popitem(last=False)
+            found.update(loaded)
+        return found
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._version = None
+
+
+categories = ReferenceCache(Category)
+categories_by_slug = ReferenceCache(Category, 'slug')
+locations = ReferenceCache(Location)
+
+
+def attach_references(posts):
+    """Подставляет категории и местоположения из памяти вместо JOIN."""
+    posts = list(posts)
+    category_map = categories.get_many(
+        post.category_id for post in posts if post.category_id)
+    location_map = locations.get_many(
+        post.location_id for post in posts if post.location_id)
+    for post in posts:
+        if post.category_id in category_map:
+            post.category = category_map[post.category_id]
+        if post.location_id in location_map:
+            post.location = location_map[post.location_id]
+    return posts
+
+
+def attach_authors(objects):
+    """Подставляет авторов отдельным запросом вместо JOIN.
+
+    Комментарии могут лежать в другой базе (COMMENTS_DATABASE).
+    """
+    objects = list(objects)
+    authors = User.objects.in_bulk({obj.author_id for obj in objects})
+    for obj in objects:
+        obj.author = authors[obj.author_id]
+    return objects
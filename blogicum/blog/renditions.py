@@ -0,0 +1,133 @@
+import os
+from collections import defaultdict
+
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from jobs.queue import enqueue
+
+from blog.cache import bump
+from blog.images import (TRANSCODED_FORMATS, WEBP, encode_image,
+                         rendition_sizes)
+from blog.models import ImageRendition, Post
+
+ORIGINAL = 'original'
+
+
+def generate_renditions(post):
+    """Создаёт производные картинки публикации, если они устарели.
+
+    Возвращает True, если набор производных картинок изменился.
+    """
+    renditions = list(post.renditions.all())
+    if not post.image:
+        if not renditions:
+            return False
+        post.renditions.all().delete()
+    elif _is_current(renditions, post.image.name):
+        return False
+    else:
+        try:
+            rows = list(_render(post))
+        except OSError:
+            # Файл пропал из хранилища или не читается как картинка.
+            return False
+        post.renditions.all().delete()
+        ImageRendition.objects.bulk_create(rows)
+    Post.objects.filter(pk=post.pk).update(updated_at=timezone.now())
+    bump(f'post:{post.pk}')
+    return True
+
+
+def _is_current(renditions, source):
+    originals = {
+        item.mime_type: item for item in renditions
+        if item.name == ORIGINAL and item.source == source
+    }
+    if not originals:
+        return False
+    transcodable = any(
+        Image.MIME.get(image_format) in originals
+        for image_format in TRANSCODED_FORMATS
+    )
+    return WEBP in originals or not transcodable
+
+
+def _render(post):
+    source = post.image.name
+    stem = os.path.splitext(os.path.basename(source))[0]
+    with post.image.open('rb'), Image.open(post.image) as image:
+        image_format = image.format
+        image = ImageOps.exif_transpose(image)
+    yield ImageRendition(
+        post=post, name=ORIGINAL, image=source,
+        mime_type=Image.MIME.get(image_format, ''),
+        width=image.width, height=image.height, source=source,
+    )
+    sizes = [(name, width) for name, width in rendition_sizes()
+             if image.width > width]
+    formats = [image_format]
+    if image_format in TRANSCODED_FORMATS:
+        formats.append('WEBP')
+        sizes.insert(0, (ORIGINAL, image.width))
+    for output_format in formats:
+        for name, width in sizes:
+            if name == ORIGINAL and output_format == image_format:
+                continue
+            resized = image.copy()
+            resized.thumbnail((width, image.height))
+            data, extension, mime_type = encode_image(resized, output_format)
+            rendition = ImageRendition(
+                post=post, name=name, mime_type=mime_type,
+                width=resized.width, height=resized.height, source=source,
+            )
+            rendition.image.save(
+                f'{stem}_{name}.{extension}', ContentFile(data), save=False)
+            yield rendition
+
+
+def pick_rendition(renditions, size):
+    """Картинка размера size и её вариант 2x из набора одного формата."""
+    image = renditions.get(size)
+    image_2x = renditions.get(f'{size}_2x')
+    if image is None:
+        return renditions.get(ORIGINAL), None
+    return image, image_2x or renditions.get(ORIGINAL)
+
+
+def renditions_by_format(post):
+    """Производные картинки, сгруппированные по MIME-типу.
+
+    Формат исходной загрузки идёт первым, WebP — последним.
+    """
+    groups = defaultdict(dict)
+    for item in post.renditions.all():
+        groups[item.mime_type][item.name] = item
+    webp = groups.pop(WEBP, None)
+    if webp:
+        groups[WEBP] = webp
+    return groups
+
+
+def accepts(request, mime_type):
+    """Разрешает ли заголовок Accept запроса данный MIME-тип."""
+    for part in request.headers.get('Accept', '').split(','):
+        media, *params = (item.strip() for item in part.split(';'))
+        if media != mime_type:
+            continue
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip() == 'q':
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+def schedule_renditions(post_id):
+    """Ставит пересчёт производных картинок в очередь фоновых задач."""
+    enqueue('blog.generate_renditions', {'post_id': post_id},
+            dedupe_key=f'renditions:{post_id}')
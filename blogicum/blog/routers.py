@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+def is_comment(model):
+    return model._meta.label == 'blog.Comment'
+
+
+class CommentRouter:
+    """Держит комментарии в базе COMMENTS_DATABASE.
+
+    Остальные модели роутер не трогает. В отдельной базе создаётся
+    только таблица комментариев; в основной она тоже остаётся, чтобы
+    старые миграции с данными выполнялись, но не используется.
+    """
+
+    def db_for_read(self, model, **hints):
+        if is_comment(model):
+            return settings.COMMENTS_DATABASE
+        return None
+
+    db_for_write = db_for_read
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if is_comment(obj1) or is_comment(obj2):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == DEFAULT_DB_ALIAS or db != settings.COMMENTS_DATABASE:
+            return None
+        return app_label == 'blog' and model_name == 'comment'
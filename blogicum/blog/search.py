@@ -0,0 +1,132 @@
+import re
+
+from django.core.paginator import InvalidPage
+from django.db import connections, router
+from django.db.models.expressions import RawSQL
+
+from blog.models import Post
+from blog.paginators import CursorPaginator, KeysetPage
+from blog.references import attach_references
+
+SEARCH_TABLE = 'blog_post_fts'
+SEARCH_TRIGGERS = {
+    'blog_post_fts_insert': f'''
+        AFTER INSERT ON blog_post BEGIN
+            INSERT INTO {SEARCH_TABLE}(rowid, title, text)
+            VALUES (new.id, new.title, new.text);
+        END''',
+    'blog_post_fts_delete': f'''
+        AFTER DELETE ON blog_post BEGIN
+            INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, text)
+            VALUES ('delete', old.id, old.title, old.text);
+        END''',
+    # Только заголовок и текст: счётчики и метки времени индекс не трогают.
+    'blog_post_fts_update': f'''
+        AFTER UPDATE OF title, text ON blog_post BEGIN
+            INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, text)
+            VALUES ('delete', old.id, old.title, old.text);
+            INSERT INTO {SEARCH_TABLE}(rowid, title, text)
+            VALUES (new.id, new.title, new.text);
+        END''',
+}
+SEARCH_TERM = re.compile(r'\w+')
+
+
+def ensure_search_index(connection):
+    """Восстанавливает индекс FTS5 и триггеры после миграций.
+
+    Создаются они миграцией 0023, но SQLite теряет триггеры, когда
+    миграция пересоздаёт таблицу blog_post; тогда они создаются заново,
+    а индекс перестраивается.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+            "AND tbl_name = 'blog_post'")
+        existing = {name for name, in cursor.fetchall()}
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} '
+            f"USING fts5(title, text, content='blog_post', "
+            f"content_rowid='id', tokenize='unicode61 remove_diacritics 2')")
+        missing = SEARCH_TRIGGERS.keys() - existing
+        for name in missing:
+            cursor.execute(f'CREATE TRIGGER {name} {SEARCH_TRIGGERS[name]}')
+        if missing:
+            cursor.execute(
+                f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) "
+                f"VALUES ('rebuild')")
+
+
+def match_expression(query):
+    """Запрос FTS5 из пользовательского текста: все слова, по префиксу.
+
+    Операторы FTS5 из ввода не передаются, поэтому синтаксических
+    ошибок не бывает. None, если в запросе нет слов.
+    """
+    terms = SEARCH_TERM.findall(query)
+    if not terms:
+        return None
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def matching_ids(match):
+    """Подзапрос с id публикаций, подходящих под выражение FTS5."""
+    return RawSQL(
+        f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s',
+        [match])
+
+
+class SearchPaginator(CursorPaginator):
+    """Постраничная выдача поиска по релевантности.
+
+    Курсор — пара (rank, id) последней публикации, как у KeysetPaginator;
+    в выдачу попадают только видимые читателям публикации.
+    """
+
+    def __init__(self, query, per_page):
+        super().__init__(per_page)
+        self.match = match_expression(query)
+        self.using = router.db_for_read(Post)
+
+    def _fetch(self, key, forward):
+        condition = ''
+        params = [self.match]
+        if key is not None:
+            condition = (
+                f'AND (f.rank, p.id) {">" if forward else "<"} (%s, %s)')
+            params += key
+        direction = '' if forward else ' DESC'
+        params.append(self.per_page + 1)
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(
+                f'SELECT f.rank, p.id FROM {SEARCH_TABLE} f '
+                f'JOIN blog_post p ON p.id = f.rowid '
+                f'WHERE {SEARCH_TABLE} MATCH %s AND p.is_visible '
+                f'{condition} '
+                f'ORDER BY f.rank{direction}, p.id{direction} LIMIT %s',
+                params)
+            return cursor.fetchall()
+
+    def _parse_key(self, values):
+        try:
+            rank, pk = values
+            return [float(rank), int(pk)]
+        except (TypeError, ValueError):
+            raise InvalidPage('Некорректный курсор страницы.')
+
+    def _key(self, row):
+        return list(row)
+
+    def _objects(self, rows):
+        posts = (
+            Post.objects.using(self.using).select_related('author')
+            .defer('text', 'text_html').in_bulk([pk for _, pk in rows])
+        )
+        return attach_references(posts[pk] for _, pk in rows if pk in posts)
+
+    def page(self, cursor=None):
+        if self.match is None:
+            return KeysetPage([], self)
+        return super().page(cursor)
@@ -0,0 +1,169 @@
+from django.db.models import F
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from jobs.queue import enqueue
+
+from blog.cache import bump
+from blog.models import (AuthorStats, Category, Comment, ImageRendition,
+                         Location, Post, User)
+from blog.references import REFERENCE_GENERATION
+from blog.renditions import schedule_renditions
+
+PREVIOUS_STATE_FIELDS = {'image', 'author', 'is_published', 'pub_date'}
+
+
+@receiver(post_save, sender=Comment)
+def touch_post_on_comment_save(sender, instance, created, **kwargs):
+    changes = {'updated_at': timezone.now()}
+    if created:
+        changes['comment_count'] = F('comment_count') + 1
+    Post.objects.filter(pk=instance.post_id).update(**changes)
+
+
+@receiver(post_delete, sender=Comment)
+def touch_post_on_comment_delete(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1, updated_at=timezone.now())
+
+
+@receiver(post_delete, sender=Post)
+def delete_post_comments(sender, instance, **kwargs):
+    Comment.objects.filter(post_id=instance.pk).delete()
+
+
+@receiver(post_delete, sender=User)
+def delete_author_comments(sender, instance, **kwargs):
+    Comment.objects.filter(author_id=instance.pk).delete()
+
+
+@receiver(post_save, sender=Category)
+def sync_category_posts_visibility(sender, instance, **kwargs):
+    Post.objects.filter(category=instance).sync_visibility(instance)
+
+
+@receiver(pre_delete, sender=Category)
+def hide_category_posts(sender, instance, **kwargs):
+    Post.objects.filter(category=instance).sync_visibility(None)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_pages(sender, instance, **kwargs):
+    bump(f'post:{instance.pk}', f'author:{instance.author_id}',
+         f'category:{instance.category_id}', 'feed')
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, **kwargs):
+    bump(f'post:{instance.post_id}', f'author:{instance.author_id}')
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous', None)
+    if created or previous is not None:
+        AuthorStats.objects.post_saved(instance, previous)
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    AuthorStats.objects.post_deleted(instance)
+
+
+@receiver(post_save, sender=Comment)
+def count_added_comment(sender, instance, created, **kwargs):
+    if created:
+        AuthorStats.objects.comment_added(instance)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    AuthorStats.objects.comment_deleted(instance)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_reference_pages(sender, **kwargs):
+    bump('site', REFERENCE_GENERATION)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_author_pages(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    bump(f'author:{instance.pk}')
+
+
+@receiver(post_save, sender=Post)
+def update_post_renditions(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous', None)
+    if created:
+        changed = bool(instance.image)
+    elif previous is None:
+        return
+    else:
+        changed = (previous.image.name != instance.image.name
+                   or instance._image_uploaded)
+    if changed and instance.image:
+        schedule_renditions(instance.pk)
+    elif changed:
+        instance.renditions.all().delete()
+
+
+def release_file(field_file):
+    """Снимает ссылку на файл в текущей транзакции.
+
+    Хранилище удаляет сам файл только после коммита, поэтому откат
+    транзакции возвращает и ссылку, и файл.
+    """
+    if field_file.name:
+        field_file.storage.delete(field_file.name)
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_state(sender, instance, update_fields=None, **kwargs):
+    """Прежние картинка и поля статистики автора изменяемой публикации."""
+    instance._previous = None
+    instance._image_uploaded = bool(
+        instance.image) and not instance.image._committed
+    if instance.pk and (
+            update_fields is None
+            or not PREVIOUS_STATE_FIELDS.isdisjoint(update_fields)):
+        instance._previous = Post.objects.filter(pk=instance.pk).only(
+            *PREVIOUS_STATE_FIELDS).first()
+
+
+@receiver(post_save, sender=Post)
+def release_replaced_image(sender, instance, **kwargs):
+    # Загрузка тех же байтов даёт то же имя, но всё равно добавляет ссылку,
+    # поэтому прежняя ссылка снимается при любой новой загрузке.
+    previous = getattr(instance, '_previous', None)
+    if previous and (previous.image.name != instance.image.name
+                     or instance._image_uploaded):
+        release_file(previous.image)
+
+
+@receiver(post_delete, sender=Post)
+def release_post_image(sender, instance, **kwargs):
+    release_file(instance.image)
+
+
+@receiver(post_delete, sender=ImageRendition)
+def release_rendition_image(sender, instance, **kwargs):
+    if instance.image.name != instance.source:
+        release_file(instance.image)
+
+
+@receiver(post_save, sender=Post)
+def schedule_publication(sender, instance, **kwargs):
+    if (instance.is_published and not instance.is_visible
+            and instance.pub_date > timezone.now()):
+        enqueue('blog.publish_due', run_at=instance.pub_date,
+                dedupe_key=f'publish_due:{instance.pub_date.isoformat()}')
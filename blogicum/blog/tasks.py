@@ -0,0 +1,24 @@
+from jobs.queue import task
+
+from blog.cache import bump
+from blog.models import Post
+from blog.notifications import DIGEST_TASK, send_comment_digests
+from blog.renditions import generate_renditions
+
+
+@task('blog.generate_renditions')
+def generate_post_renditions(post_id):
+    post = Post.objects.filter(pk=post_id).only('id', 'image').first()
+    if post is not None:
+        generate_renditions(post)
+
+
+@task('blog.publish_due')
+def publish_due():
+    if Post.objects.publish_due():
+        bump('site')
+
+
+@task(DIGEST_TASK)
+def send_digests():
+    send_comment_digests()
@@ -0,0 +1,48 @@
+from django import template
+from django.conf import settings
+from django.urls import reverse
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from blog.cache import render_post_cards
+from blog.renditions import pick_rendition, renditions_by_format
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def fragment(context, template_name, url_name, *args):
+    """Персональная часть страницы.
+
+    В режиме PAGE_FRAGMENTS = 'esi' вместо неё выводится <esi:include>,
+    и остальная страница становится общей для всех пользователей.
+    """
+    if settings.PAGE_FRAGMENTS == 'esi':
+        return format_html(
+            '<esi:include src="{}"/>', reverse(url_name, args=args))
+    fragment_template = context.template.engine.get_template(template_name)
+    with context.push():
+        return fragment_template.render(context)
+
+
+@register.simple_tag
+def post_cards(posts):
+    return [mark_safe(card) for card in render_post_cards(list(posts))]
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post, size):
+    """Картинка нужного размера: <picture> с WebP и запасным <img>."""
+    groups = renditions_by_format(post)
+    sources = [
+        dict(zip(('mime_type', 'image', 'image_2x'),
+                 (mime_type, *pick_rendition(group, size))))
+        for mime_type, group in groups.items()
+    ]
+    fallback = sources.pop(0) if sources else {}
+    return {
+        'post': post,
+        'sources': [source for source in sources if source['image']],
+        'image': fallback.get('image'),
+        'image_2x': fallback.get('image_2x'),
+    }
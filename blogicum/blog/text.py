@@ -0,0 +1,16 @@
+from django.template.defaultfilters import linebreaksbr
+from django.utils.text import Truncator
+
+EXCERPT_WORDS = 10
+EXCERPT_MAX_LENGTH = 512
+
+
+def make_excerpt(text):
+    """То же, что фильтр truncatewords:EXCERPT_WORDS."""
+    excerpt = Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+    return excerpt[:EXCERPT_MAX_LENGTH]
+
+
+def render_text(text):
+    """HTML текста, как его выводит фильтр linebreaksbr."""
+    return str(linebreaksbr(text, autoescape=True))
@@ -6,7 +6,18 @@ app_name = 'blog'
 
 urlpatterns = [
     path('', views.IndexListView.as_view(), name='index'),
+    path('search/', views.search, name='search'),
     path('posts/<int:pk>/', views.post_detail, name='post_detail'),
+    path(
+        'posts/<int:pk>/comments/',
+        views.post_comments,
+        name='post_comments'
+    ),
+    path(
+        'posts/<int:pk>/image/<str:size>/',
+        views.post_image_file,
+        name='post_image'
+    ),
     path(
         'profile/edit/',
         views.ProfileUpdateView.as_view(),
@@ -45,4 +56,29 @@ urlpatterns = [
     ),
     path('category/<slug:category_slug>/',
          views.category_posts, name='category_posts'),
+    path(
+        'fragments/user_nav/',
+        views.user_nav_fragment,
+        name='user_nav_fragment'
+    ),
+    path(
+        'fragments/profile/<str:username>/',
+        views.profile_tools_fragment,
+        name='profile_tools_fragment'
+    ),
+    path(
+        'fragments/posts/<int:pk>/<int:author_id>/',
+        views.post_tools_fragment,
+        name='post_tools_fragment'
+    ),
+    path(
+        'fragments/comments/<int:post_id>/<int:pk>/<int:author_id>/',
+        views.comment_tools_fragment,
+        name='comment_tools_fragment'
+    ),
+    path(
+        'stats/card-cache/',
+        views.card_cache_stats_view,
+        name='card_cache_stats'
+    ),
 ]
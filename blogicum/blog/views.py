@@ -1,40 +1,156 @@
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.paginator import Paginator
-from django.db.models import Count
-from django.shortcuts import get_object_or_404, redirect, render
+from django.core.paginator import InvalidPage
+from django.http import Http404, HttpResponseRedirect, JsonResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.template.response import TemplateResponse
 from django.urls import reverse, reverse_lazy
-from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 from django.views.generic.edit import DeletionMixin
 
+from core.conditional import conditional_page, make_etag
+from core.replicas import replica_reads
+from core.writer import serialized_writes
+
+from blog.cache import cache_anonymous_page, card_cache_stats
 from blog.forms import CommentForm, PostForm, ProfileForm
-from blog.mixins import CommentMixin, DispatchMixin
-from blog.models import Category, Comment, Post, User
+from blog.mixins import CommentMixin, DispatchMixin, KeysetPaginationMixin
+from blog.models import AuthorStats, Comment, Post, User
+from blog.notifications import notify_post_author
+from blog.paginators import KeysetPaginator, paginate
+from blog.references import (attach_authors, attach_references,
+                             categories_by_slug)
+from blog.renditions import accepts, pick_rendition, renditions_by_format
+from blog.search import SearchPaginator
 
 MAX_POSTS = 10
+COMMENTS_PER_PAGE = 20
+FEED_VALIDATOR_FIELDS = (
+    'id', 'pub_date', 'updated_at', 'comment_count', 'author__username',
+    'category_id', 'location_id',
+)
+
+
+def get_published_category_or_404(category_slug):
+    category = categories_by_slug.get(category_slug)
+    if category is None or not category.is_published:
+        raise Http404('Категория не найдена.')
+    return category
+
+
+def feed_validators(request, posts, updated_at=None, *parts):
+    """Валидаторы по той же странице ленты, что покажет представление."""
+    page = paginate(
+        request,
+        posts.select_related('author').only(*FEED_VALIDATOR_FIELDS),
+        MAX_POSTS,
+    )
+    attach_references(page)
+    rows = [
+        (post.pk, post.updated_at, post.comment_count, post.author.username,
+         post.category and post.category.updated_at,
+         post.location and post.location.updated_at)
+        for post in page
+    ]
+    stamps = [updated_at] + [
+        stamp for row in rows for stamp in (row[1], row[4], row[5])
+    ]
+    return (
+        make_etag(request, rows, page.has_next(), page.has_previous(),
+                  updated_at, *parts),
+        max(filter(None, stamps), default=None),
+    )
+
+
+def index_validators(request):
+    return feed_validators(
+        request, Post.objects.visible().order_by('-pub_date', '-id'))
 
 
-class ProfileListView(ListView):
+def category_validators(request, category_slug):
+    category = get_published_category_or_404(category_slug)
+    return feed_validators(
+        request,
+        Post.objects.visible().filter(category=category)
+        .order_by('-pub_date', '-id'),
+        category.updated_at,
+    )
+
+
+def get_profile_or_404(request, username):
+    """Пользователь профиля; загружается один раз за запрос."""
+    profile = getattr(request, 'profile', None)
+    if profile is None or profile.username != username:
+        profile = get_object_or_404(User, username=username)
+        profile.author_stats = AuthorStats.objects.for_author(profile)
+        request.profile = profile
+    return profile
+
+
+def profile_validators(request, username):
+    profile = get_profile_or_404(request, username)
+    stats = profile.author_stats
+    return feed_validators(
+        request,
+        Post.objects.filter(author_id=profile.pk).order_by('-pub_date', '-id'),
+        None,
+        profile.get_full_name(),
+        profile.is_staff,
+        stats.post_count,
+        stats.published_count,
+        stats.comment_count,
+        stats.last_post_at,
+    )
+
+
+def post_validators(request, pk):
+    post = Post.objects.select_related('author').only(
+        'updated_at', 'comment_count', 'is_visible', 'author__username',
+        'category_id', 'location_id',
+    ).filter(pk=pk).first()
+    if post is None:
+        return None, None
+    attach_references([post])
+    stamps = (post.updated_at,
+              post.category and post.category.updated_at,
+              post.location and post.location.updated_at)
+    return (
+        make_etag(request, post.comment_count, post.is_visible,
+                  post.author.username, *stamps),
+        max(filter(None, stamps)),
+    )
+
+
+@method_decorator(
+    [replica_reads, cache_anonymous_page,
+     conditional_page(profile_validators)],
+    name='dispatch')
+class ProfileListView(KeysetPaginationMixin, ListView):
     model = Post
     paginate_by = MAX_POSTS
     template_name = 'blog/profile.html'
 
     def get_queryset(self):
+        self.profile = get_profile_or_404(
+            self.request, self.kwargs['username'])
         return (
-            self.model.objects.select_related('author', 'category', 'location')
-            .filter(author__username=self.kwargs['username'])
-            .annotate(comment_count=Count("comment"))
-            .order_by("-pub_date"))
+            self.model.objects.select_related('author')
+            .defer('text', 'text_html')
+            .filter(author_id=self.profile.pk)
+            .order_by("-pub_date", "-id"))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['profile'] = get_object_or_404(
-            User,
-            username=self.kwargs['username'])
+        context['profile'] = self.profile
+        context['stats'] = self.profile.author_stats
         return context
 
 
+@method_decorator(serialized_writes, name='dispatch')
 class ProfileUpdateView(LoginRequiredMixin, UpdateView):
     model = User
     template_name = 'blog/user.html'
@@ -47,66 +163,122 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         return reverse('blog:profile', args=[self.request.user])
 
 
-class IndexListView(ListView):
+@method_decorator(
+    [replica_reads, cache_anonymous_page,
+     conditional_page(index_validators)],
+    name='dispatch')
+class IndexListView(KeysetPaginationMixin, ListView):
     model = Post
     paginate_by = MAX_POSTS
     template_name = 'blog/index.html'
 
     def get_queryset(self):
         return (
-            self.model.objects.select_related('location', 'author', 'category')
-            .filter(is_published=True,
-                    category__is_published=True,
-                    pub_date__lte=timezone.now())
-            .annotate(comment_count=Count("comment"))
-            .order_by("-pub_date"))
+            self.model.objects.visible()
+            .select_related('author')
+            .defer('text', 'text_html')
+            .order_by("-pub_date", "-id"))
+
 
+def get_visible_post_or_404(request, queryset, pk):
+    """Публикация доступна читателям, если видима, и всегда — автору."""
+    post = get_object_or_404(queryset, pk=pk)
+    if not post.is_visible and post.author_id != request.user.id:
+        raise Http404('Публикация не найдена.')
+    return post
 
+
+def post_comments_page(post, cursor=None):
+    page = KeysetPaginator(
+        Comment.objects.filter(post=post).order_by('created_at', 'id'),
+        COMMENTS_PER_PAGE,
+    ).page(cursor)
+    page.object_list = attach_authors(page.object_list)
+    return page
+
+
+@replica_reads
+@cache_anonymous_page
+@conditional_page(post_validators)
 def post_detail(request, pk):
-    post = get_object_or_404(
-        Post.objects.select_related('category', 'location', 'author'),
-        pk=pk
-    )
-    if post.author != request.user:
-        post = get_object_or_404(
-            Post.objects.select_related('category', 'location', 'author')
-            .filter(
-                pub_date__lte=timezone.now(),
-                is_published=True,
-                category__is_published=True
-            ),
-            pk=pk
-        )
-    post_comments = Comment.objects.filter(post=post).select_related('author')
+    post = get_visible_post_or_404(
+        request, Post.objects.select_related('author'), pk)
+    attach_references([post])
     context = {
         'post': post,
         'form': CommentForm(),
-        'comments': post_comments,
+        'comments': post_comments_page(post),
     }
-    return render(request, 'blog/detail.html', context)
-
-
+    return TemplateResponse(request, 'blog/detail.html', context)
+
+
+@replica_reads
+@cache_anonymous_page
+def post_comments(request, pk):
+    post = get_visible_post_or_404(
+        request, Post.objects.only('id', 'author_id', 'is_visible'), pk)
+    try:
+        comments = post_comments_page(post, request.GET.get('cursor'))
+    except InvalidPage:
+        raise Http404('Страница не найдена.')
+    context = {'post': post, 'comments': comments}
+    return TemplateResponse(request, 'includes/comment_list.html', context)
+
+
+@replica_reads
+def search(request):
+    query = request.GET.get('q', '').strip()
+    page_obj = None
+    if query:
+        try:
+            page_obj = SearchPaginator(query, MAX_POSTS).page(
+                request.GET.get('cursor'))
+        except InvalidPage:
+            raise Http404('Страница не найдена.')
+    context = {'query': query, 'page_obj': page_obj}
+    return TemplateResponse(request, 'blog/search.html', context)
+
+
+def post_image_file(request, pk, size):
+    """Перенаправляет на лучший формат картинки по заголовку Accept."""
+    post = get_visible_post_or_404(
+        request, Post.objects.only('id', 'author_id', 'is_visible', 'image'),
+        pk)
+    if not post.image:
+        raise Http404('У публикации нет картинки.')
+    groups = renditions_by_format(post)
+    candidates = [
+        group for mime_type, group in reversed(groups.items())
+        if accepts(request, mime_type)
+    ]
+    candidates.append(next(iter(groups.values()), {}))
+    url = post.image.url
+    for group in candidates:
+        image, _ = pick_rendition(group, size)
+        if image is not None:
+            url = image.image.url
+            break
+    response = HttpResponseRedirect(url)
+    patch_vary_headers(response, ['Accept'])
+    return response
+
+
+@replica_reads
+@cache_anonymous_page
+@conditional_page(category_validators)
 def category_posts(request, category_slug):
-    category = get_object_or_404(
-        Category,
-        slug=category_slug, is_published=True
-    )
-    post_list = Post.objects.select_related('author',
-                                            'category',
-                                            'location').filter(
-        pub_date__lte=timezone.now(),
-        is_published=True,
-        category__is_published=True,
-        category=category
-    ).order_by('-pub_date').annotate(comment_count=Count('comment'))
-    paginator = Paginator(post_list, MAX_POSTS)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    context = {'page_obj': page_obj}
+    category = get_published_category_or_404(category_slug)
+    post_list = (
+        Post.objects.visible().select_related('author')
+        .defer('text', 'text_html')
+        .filter(category=category).order_by('-pub_date', '-id'))
+    page_obj = paginate(request, post_list, MAX_POSTS)
+    page_obj.object_list = attach_references(page_obj.object_list)
     context = {'category': category, 'page_obj': page_obj}
-    return render(request, 'blog/category.html', context)
+    return TemplateResponse(request, 'blog/category.html', context)
 
 
+@method_decorator(serialized_writes, name='dispatch')
 class PostCreateView(LoginRequiredMixin, CreateView):
     model = Post
     template_name = 'blog/create.html'
@@ -123,6 +295,7 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         )
 
 
+@method_decorator(serialized_writes, name='dispatch')
 class PostUpdateView(LoginRequiredMixin, DispatchMixin, UpdateView):
     model = Post
     template_name = 'blog/create.html'
@@ -138,6 +311,7 @@ class PostDeleteView(DeletionMixin, PostUpdateView):
 
 
 @login_required
+@serialized_writes
 def add_comment(request, post_id, comment_id=None):
     post = get_object_or_404(Post, pk=post_id)
     form = CommentForm(request.POST or None)
@@ -146,14 +320,51 @@ def add_comment(request, post_id, comment_id=None):
         comment.author = request.user
         comment.post = post
         comment.save()
+        notify_post_author(comment, post)
     return redirect('blog:post_detail', pk=post_id)
 
 
+@method_decorator(serialized_writes, name='dispatch')
 class CommentUpdateView(LoginRequiredMixin, DispatchMixin,
                         CommentMixin, UpdateView):
     pass
 
 
+@method_decorator(serialized_writes, name='dispatch')
 class CommentDeleteView(LoginRequiredMixin, DispatchMixin,
                         CommentMixin, DeleteView):
     pass
+
+
+@cache_control(private=True)
+def user_nav_fragment(request):
+    return TemplateResponse(request, 'includes/user_nav.html')
+
+
+@cache_control(private=True)
+def profile_tools_fragment(request, username):
+    profile = request.user if request.user.username == username else None
+    return TemplateResponse(
+        request, 'includes/profile_tools.html', {'profile': profile})
+
+
+@cache_control(private=True)
+def post_tools_fragment(request, pk, author_id):
+    context = {
+        'post': Post(pk=pk, author_id=author_id),
+        'form': CommentForm(),
+    }
+    return TemplateResponse(request, 'includes/post_tools.html', context)
+
+
+@cache_control(private=True)
+def comment_tools_fragment(request, post_id, pk, author_id):
+    context = {
+        'comment': Comment(pk=pk, post_id=post_id, author_id=author_id),
+    }
+    return TemplateResponse(request, 'includes/comment_tools.html', context)
+
+
+@staff_member_required
+def card_cache_stats_view(request):
+    return JsonResponse(card_cache_stats())
@@ -1,3 +1,4 @@
+import tempfile
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -15,6 +16,8 @@ INSTALLED_APPS = [
     'pages.apps.PagesConfig',
     'blog.apps.BlogConfig',
     'core.apps.CoreConfig',
+    'jobs.apps.JobsConfig',
+    'outbox.apps.OutboxConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -31,6 +34,8 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'core.middleware.EsiIncludeMiddleware',
+    'core.middleware.ReadYourWritesMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -68,6 +73,39 @@ DATABASES = {
     }
 }
 
+# Реплики — псевдонимы из DATABASES с копией основной базы, например
+# 'replica': {'ENGINE': ..., 'NAME': BASE_DIR / 'replica.sqlite3',
+#             'TEST': {'MIRROR': 'default'}};
+# копии SQLite обновляет команда sync_replicas.
+DATABASE_REPLICAS = []
+
+# Псевдоним базы для комментариев, например отдельный файл SQLite
+# 'comments': {'ENGINE': ..., 'NAME': BASE_DIR / 'comments.sqlite3'}:
+# тогда запись комментариев не занимает блокировку основной базы.
+COMMENTS_DATABASE = 'default'
+
+DATABASE_ROUTERS = [
+    'blog.routers.CommentRouter',
+    'core.replicas.ReplicaRouter',
+]
+
+# Реплика, снимок которой старше REPLICA_MAX_LAG секунд, не читается;
+# sync_replicas --interval должен обновлять реплики чаще.
+REPLICA_MAX_LAG = 30
+
+# После записи чтения пользователя столько секунд идут в основную базу:
+# к концу этого окна любая свежая реплика уже содержит запись.
+PRIMARY_STICKY_COOKIE = 'primary_reads'
+PRIMARY_STICKY_SECONDS = REPLICA_MAX_LAG
+
+# Набор PRAGMA для соединений с SQLite, см. core.sqlite.SQLITE_PROFILES.
+SQLITE_PROFILE = 'production'
+
+# Изменяющие запросы выполняются одним потоком-писателем на процесс
+# (core.writer); в одной транзакции — до WRITE_BATCH_SIZE запросов.
+SERIALIZE_WRITES = False
+WRITE_BATCH_SIZE = 16
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -95,7 +133,11 @@ USE_L10N = True
 
 USE_TZ = True
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Письма сначала попадают в таблицу исходящей почты, а отправляет их
+# фоновая задача через OUTBOX_DELIVERY_BACKEND.
+EMAIL_BACKEND = 'outbox.backends.OutboxBackend'
+
+OUTBOX_DELIVERY_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
@@ -116,3 +158,53 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 STATICFILES_DIRS = [
     BASE_DIR / "html",
 ]
+
+# Поколения страниц и справочников должны быть общими для всех процессов,
+# иначе изменение в одном из них не сбросит кеши остальных. Файловый кеш
+# общий для процессов одной машины. Он не вытесняет ключи: по ключу на
+# публикацию и автора, и любое вытеснение давало бы ложные сбросы.
+# Для нескольких машин сюда подключается memcached с запасом памяти,
+# при котором он не вытесняет записи.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogicum',
+    },
+    'generations': {
+        'BACKEND': 'core.cache.GenerationFileCache',
+        'LOCATION': str(Path(tempfile.gettempdir()) / 'blogicum-generations'),
+    },
+}
+
+PAGE_CACHE_TIMEOUT = 60 * 10
+
+CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+REFERENCE_CACHE_SIZE = 1000
+
+# Ширины производных картинок публикаций; к каждой добавляется вариант 2x.
+POST_IMAGE_RENDITIONS = {'card': 640, 'detail': 960}
+
+# Загрузки крупнее этого числа пикселей уменьшаются при сохранении.
+POST_IMAGE_PIXEL_BUDGET = 4096 * 4096
+
+JOBS_MAX_ATTEMPTS = 5
+# Задержка перед повтором: JOBS_RETRY_DELAY * 2 ** (попытка - 1) секунд.
+JOBS_RETRY_DELAY = 30
+JOBS_RETRY_MAX_DELAY = 60 * 60
+# Задача, которую обработчик держит дольше, возвращается в очередь.
+JOBS_LEASE_TIMEOUT = 60 * 10
+# Выполненные задачи хранятся неделю; обработчик чистит их раз в час.
+JOBS_KEEP_DONE = 60 * 60 * 24 * 7
+JOBS_PRUNE_INTERVAL = 60 * 60
+
+# Сколько писем забирается из исходящей почты за одну выборку.
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 5
+
+# Уведомления о комментариях копятся столько секунд и уходят одной сводкой.
+COMMENT_DIGEST_WINDOW = 60 * 15
+
+# 'inline' — персональные фрагменты рисуются прямо в странице;
+# 'esi' — страница отдаётся общей оболочкой с <esi:include>.
+PAGE_FRAGMENTS = 'inline'
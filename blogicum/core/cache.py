@@ -0,0 +1,15 @@
+from django.core.cache.backends.filebased import FileBasedCache
+
+
+class GenerationFileCache(FileBasedCache):
+    """Файловый кеш без вытеснения для поколений.
+
+    FileBasedCache при каждой записи перечисляет каталог, а после
+    MAX_ENTRIES ключей удаляет случайную треть. Поколения вытеснять
+    нельзя: пропавший ключ сбрасывает страницы и справочники без
+    изменений в данных. Ключей столько, сколько публикаций и авторов,
+    и каждый занимает несколько байт, поэтому кеш не чистится.
+    """
+
+    def _cull(self):
+        pass
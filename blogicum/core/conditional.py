@@ -0,0 +1,50 @@
+import hashlib
+import os
+from datetime import datetime, timezone
+from functools import lru_cache, wraps
+
+from django.conf import settings
+from django.views.decorators.http import condition
+
+
+def make_etag(request, *parts):
+    """Строит ETag; страницы различаются для разных пользователей."""
+    raw = repr((request.user.pk, *parts))
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def conditional_page(get_validators):
+    """Отвечает 304 до рендеринга шаблона, если страница не изменилась.
+
+    get_validators(request, *args, **kwargs) возвращает пару
+    (etag, last_modified) и вызывается один раз на запрос.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            etag, last_modified = get_validators(request, *args, **kwargs)
+            return condition(
+                etag_func=lambda *args, **kwargs: etag,
+                last_modified_func=lambda *args, **kwargs: last_modified,
+            )(view)(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@lru_cache(maxsize=None)
+def templates_modified():
+    """Время последнего изменения шаблонов; меняется только при деплое."""
+    mtimes = (
+        os.path.getmtime(os.path.join(root, name))
+        for root, _, files in os.walk(settings.TEMPLATES_DIR)
+        for name in files
+    )
+    return datetime.fromtimestamp(max(mtimes, default=0), tz=timezone.utc)
+
+
+def template_validators(request, *args, **kwargs):
+    """Валидаторы для страниц, которые строятся только из шаблона."""
+    modified = templates_modified()
+    return make_etag(request, request.path, modified), modified
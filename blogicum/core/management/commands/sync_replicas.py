@@ -0,0 +1,43 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from core.replicas import mark_synced
+
+
+class Command(BaseCommand):
+    help = ('Копирует основную базу SQLite в реплики из DATABASE_REPLICAS '
+            'через backup API: копия согласована даже при идущих записях. '
+            'Чтобы реплики читались, интервал должен быть меньше '
+            'REPLICA_MAX_LAG.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Повторять каждые N секунд вместо однократного запуска.')
+
+    def handle(self, *args, interval=0, **options):
+        source = connections[DEFAULT_DB_ALIAS]
+        if source.vendor != 'sqlite':
+            raise CommandError(
+                'Команда копирует только SQLite; реплики других СУБД '
+                'настраиваются средствами самой СУБД.')
+        while True:
+            self.sync(source)
+            if not interval:
+                break
+            time.sleep(interval)
+
+    def sync(self, source):
+        source.ensure_connection()
+        for alias in settings.DATABASE_REPLICAS:
+            target = connections[alias]
+            target.ensure_connection()
+            # Снимок содержит всё, что закоммичено до начала копирования.
+            snapshot_at = time.time()
+            source.connection.backup(target.connection)
+            target.close()
+            mark_synced(alias, snapshot_at)
+            self.stdout.write(f'Реплика {alias} обновлена.')
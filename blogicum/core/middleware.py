@@ -0,0 +1,68 @@
+import re
+
+from django.urls import Resolver404, resolve
+
+from core.replicas import stick_to_primary, track_writes
+from core.writer import SAFE_METHODS
+
+ESI_INCLUDE = re.compile(rb'<esi:include src="([^"]+)"\s*/>')
+
+
+class EsiIncludeMiddleware:
+    """Подставляет <esi:include> во фрагменты страницы.
+
+    Если перед приложением стоит прокси, умеющий ESI (заголовок
+    Surrogate-Capability), сборка страницы остаётся ему.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (response.streaming
+                or not response.get('Content-Type', '').startswith(
+                    'text/html')
+                or b'<esi:include' not in response.content):
+            return response
+        if 'ESI/1.0' in request.headers.get('Surrogate-Capability', ''):
+            response['Surrogate-Control'] = 'content="ESI/1.0"'
+            return response
+        response.content = ESI_INCLUDE.sub(
+            lambda match: self.render_fragment(request, match.group(1)),
+            response.content,
+        )
+        return response
+
+    def render_fragment(self, request, src):
+        try:
+            match = resolve(src.decode())
+        except Resolver404:
+            return b''
+        fragment = match.func(request, *match.args, **match.kwargs)
+        if hasattr(fragment, 'render'):
+            fragment.render()
+        if fragment.status_code != 200:
+            return b''
+        return fragment.content
+
+
+class ReadYourWritesMiddleware:
+    """Привязывает чтения пользователя к основной базе после записи.
+
+    Если изменяющий запрос что-то записал и завершился успешно, ставит
+    подписанную cookie на PRIMARY_STICKY_SECONDS секунд; её проверяет
+    core.replicas.replica_reads.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method in SAFE_METHODS:
+            return self.get_response(request)
+        with track_writes() as writes:
+            response = self.get_response(request)
+        if writes['happened'] and response.status_code < 400:
+            stick_to_primary(response)
+        return response
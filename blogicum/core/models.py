@@ -11,6 +11,31 @@ class BaseModel(models.Model):
         auto_now_add=True,
         verbose_name='Добавлено'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменено'
+    )
 
     class Meta:
         abstract = True
+
+
+class StoredFile(models.Model):
+    """Файл в хранилище с адресацией по содержимому и число ссылок на него."""
+
+    name = models.CharField(
+        max_length=255,
+        primary_key=True,
+        verbose_name='Имя файла'
+    )
+    references = models.PositiveIntegerField(
+        default=1,
+        verbose_name='Ссылок'
+    )
+
+    class Meta:
+        verbose_name = 'файл'
+        verbose_name_plural = 'Файлы'
+
+    def __str__(self):
+        return f'{self.name} ({self.references})'
@@ -0,0 +1,153 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+from core.writer import SAFE_METHODS
+
+STICKY_SALT = 'core.replicas'
+WRITE_STATEMENTS = {'INSERT', 'UPDATE', 'DELETE'}
+
+_replica_reads = ContextVar('replica_reads', default=())
+_writes = ContextVar('primary_writes', default=None)
+
+
+@contextmanager
+def replica_reads_enabled(aliases):
+    """Чтения блога внутри блока идут в реплики aliases."""
+    token = _replica_reads.set(tuple(aliases))
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def primary_reads():
+    """Чтения внутри блока идут в основную базу, даже в replica_reads."""
+    return replica_reads_enabled(())
+
+
+def _synced_key(alias):
+    return f'replicas:{alias}:synced_at'
+
+
+def mark_synced(alias, snapshot_at):
+    """Запоминает момент снимка, с которого обновлена реплика.
+
+    Время хранится в общем для процессов кеше CACHES['generations'].
+    """
+    caches['generations'].set(_synced_key(alias), snapshot_at, timeout=None)
+
+
+def fresh_replicas():
+    """Реплики, отстающие от основной базы не больше REPLICA_MAX_LAG."""
+    if not settings.DATABASE_REPLICAS:
+        return ()
+    stamps = caches['generations'].get_many(
+        [_synced_key(alias) for alias in settings.DATABASE_REPLICAS])
+    deadline = time.time() - settings.REPLICA_MAX_LAG
+    return tuple(
+        alias for alias in settings.DATABASE_REPLICAS
+        if stamps.get(_synced_key(alias), 0) >= deadline
+    )
+
+
+@contextmanager
+def track_writes():
+    """Отмечает, записал ли что-нибудь код внутри блока.
+
+    Отметка — изменяемый объект, поэтому её видит и поток-писатель,
+    который выполняет запрос в копии контекста.
+    """
+    writes = {'happened': False}
+    token = _writes.set(writes)
+    try:
+        yield writes
+    finally:
+        _writes.reset(token)
+
+
+def _note_write(execute, sql, params, many, context):
+    writes = _writes.get()
+    if writes is not None and sql.lstrip()[:6].upper() in WRITE_STATEMENTS:
+        writes['happened'] = True
+    return execute(sql, params, many, context)
+
+
+def watch_writes(sender, connection, **kwargs):
+    """Подключает к соединению отметку записей для track_writes."""
+    if _note_write not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_note_write)
+
+
+def reads_primary(request):
+    """Пользователь недавно писал: его чтения идут в основную базу."""
+    return request.get_signed_cookie(
+        settings.PRIMARY_STICKY_COOKIE, default=None, salt=STICKY_SALT,
+        max_age=settings.PRIMARY_STICKY_SECONDS) is not None
+
+
+def stick_to_primary(response):
+    response.set_signed_cookie(
+        settings.PRIMARY_STICKY_COOKIE, 'primary', salt=STICKY_SALT,
+        max_age=settings.PRIMARY_STICKY_SECONDS, httponly=True,
+        samesite='Lax')
+
+
+def replica_reads(view):
+    """Разрешает представлению читать публикации из реплик.
+
+    Шаблон рендерится здесь же, чтобы и его запросы ушли в реплику.
+    Изменяющие запросы, пользователи с cookie из stick_to_primary и
+    запросы, для которых нет достаточно свежей реплики, читают из
+    основной базы.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in SAFE_METHODS or reads_primary(request):
+            return view(request, *args, **kwargs)
+        aliases = fresh_replicas()
+        if not aliases:
+            return view(request, *args, **kwargs)
+        with replica_reads_enabled(aliases):
+            response = view(request, *args, **kwargs)
+            if not getattr(response, 'is_rendered', True):
+                response.render()
+        return response
+    return wrapper
+
+
+class ReplicaRouter:
+    """Чтения блога внутри replica_reads уходят в свежие реплики.
+
+    Записи и все остальные чтения, включая сессии и пользователей,
+    идут в основную базу. Реплики — копии основной базы, поэтому
+    миграции к ним не применяются.
+    """
+
+    app_labels = {'blog'}
+
+    def db_for_read(self, model, **hints):
+        aliases = _replica_reads.get()
+        if aliases and model._meta.app_label in self.app_labels:
+            return random.choice(aliases)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
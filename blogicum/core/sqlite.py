@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.db.migrations.recorder import MigrationRecorder
+
+# Значения PRAGMA по профилям; порядок важен: journal_mode ставится первым.
+SQLITE_PROFILES = {
+    # Настройки SQLite по умолчанию: журнал отката, писатель блокирует
+    # читателей.
+    'default': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+    },
+    # WAL: читатели не ждут писателя; NORMAL в WAL не теряет целостность,
+    # а лишь последние транзакции при отключении питания.
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,
+        'temp_store': 'MEMORY',
+    },
+}
+
+
+def configure_connection(sender, connection, **kwargs):
+    """Применяет профиль SQLITE_PROFILE к новому соединению с SQLite."""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = SQLITE_PROFILES[settings.SQLITE_PROFILE]
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def begin_write(connection):
+    """Сразу берёт блокировку записи в открытой транзакции SQLite.
+
+    Django начинает транзакции отложенным BEGIN: транзакция, которая
+    сначала читает, а потом пишет, не ждёт busy_timeout и падает с
+    "database is locked", если кто-то успел записать. Пустой DELETE
+    первым оператором действует как BEGIN IMMEDIATE.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    table = connection.ops.quote_name(
+        MigrationRecorder.Migration._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE 0')
@@ -0,0 +1,99 @@
+import hashlib
+import os
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+
+from core.models import StoredFile
+from core.sqlite import begin_write
+
+SHARD_DEPTH = 2
+SHARD_WIDTH = 2
+
+
+def content_name(directory, digest, extension):
+    """Имя файла по хешу: post_images/ab/cd/abcd….jpg."""
+    shards = [
+        digest[level * SHARD_WIDTH:(level + 1) * SHARD_WIDTH]
+        for level in range(SHARD_DEPTH)
+    ]
+    return os.path.join(directory, *shards, f'{digest}{extension}')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранилище, которое называет файлы по SHA-256 содержимого.
+
+    Одинаковые загрузки хранятся один раз; StoredFile считает ссылки,
+    и delete() удаляет файл только вместе с последней ссылкой. Ссылка
+    добавляется раньше, чем проверяется наличие файла: файл, удалённый
+    одновременно с новой загрузкой, записывается заново.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        directory = os.path.dirname(name)
+        extension = os.path.splitext(name)[1].lower()
+        os.makedirs(self.location, exist_ok=True)
+        digest = hashlib.sha256()
+        handle, temp_path = tempfile.mkstemp(
+            dir=self.location, prefix='.upload-')
+        try:
+            with os.fdopen(handle, 'wb') as temp_file:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+            name = content_name(directory, digest.hexdigest(), extension)
+            self._add_reference(name)
+            path = self.path(name)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(temp_path, self.file_permissions_mode)
+                os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return name.replace('\\', '/')
+
+    def _add_reference(self, name):
+        if StoredFile.objects.filter(name=name).update(
+                references=F('references') + 1):
+            return
+        try:
+            with transaction.atomic():
+                StoredFile.objects.create(name=name)
+        except IntegrityError:
+            StoredFile.objects.filter(name=name).update(
+                references=F('references') + 1)
+
+    def delete(self, name):
+        """Снимает одну ссылку; файл удаляется вместе с последней.
+
+        Строка блокируется на время проверки, а сам файл удаляется после
+        коммита и только если новой ссылки на него так и не появилось.
+        """
+        with transaction.atomic():
+            begin_write(connection)
+            stored = (
+                StoredFile.objects.select_for_update()
+                .filter(name=name).first())
+            if stored is not None and stored.references > 1:
+                StoredFile.objects.filter(name=name).update(
+                    references=F('references') - 1)
+                return
+            if stored is not None:
+                stored.delete()
+            transaction.on_commit(lambda: self._remove_unreferenced(name))
+
+    def _remove_unreferenced(self, name):
+        if not StoredFile.objects.filter(name=name).exists():
+            super().delete(name)
+
+
+post_image_storage = ContentAddressedStorage()
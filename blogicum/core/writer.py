@@ -0,0 +1,151 @@
+import contextvars
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from functools import wraps
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+from core.sqlite import begin_write
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class WriteQueue:
+    """Один поток-писатель на процесс.
+
+    Записи выстраиваются в очередь и выполняются пачками до
+    WRITE_BATCH_SIZE штук в одной короткой транзакции: каждая запись в
+    своей точке сохранения, а результат отдаётся только после коммита.
+    SQLite не держит несколько писателей, поэтому потоки запросов больше
+    не спорят за блокировку записи, а чтения идут по своим соединениям.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._queue = None
+        self._thread = None
+        self._pid = None
+
+    def in_writer(self):
+        return getattr(self._local, 'writer', False)
+
+    def _ensure_started(self):
+        with self._lock:
+            if (self._thread is not None and self._pid == os.getpid()
+                    and self._thread.is_alive()):
+                return self._queue
+            self._queue = queue.Queue()
+            self._thread = threading.Thread(
+                target=self._run, args=(self._queue,), name='write-queue',
+                daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+            return self._queue
+
+    def submit(self, func, *args, **kwargs):
+        """Выполняет func в потоке-писателе и возвращает её результат."""
+        if self.in_writer():
+            return func(*args, **kwargs)
+        # Запись выполняется в копии контекста запроса: так до неё доходят
+        # отметки вроде core.replicas.track_writes.
+        context = contextvars.copy_context()
+        future = Future()
+        self._ensure_started().put(
+            (context.run, (func, *args), kwargs, future))
+        return future.result()
+
+    def stop(self):
+        """Дописывает очередь и закрывает соединение потока-писателя."""
+        with self._lock:
+            thread, tasks = self._thread, self._queue
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            tasks.put(None)
+            thread.join()
+
+    def _next_batch(self, tasks):
+        batch = []
+        item = tasks.get()
+        while item is not None:
+            batch.append(item)
+            if len(batch) >= settings.WRITE_BATCH_SIZE:
+                break
+            try:
+                item = tasks.get_nowait()
+            except queue.Empty:
+                break
+        return batch, item is None
+
+    def _write(self, batch):
+        outcomes = []
+        try:
+            close_old_connections()
+            with transaction.atomic():
+                begin_write(connection)
+                for func, args, kwargs, future in batch:
+                    try:
+                        with transaction.atomic():
+                            outcomes.append(
+                                (future, func(*args, **kwargs), None))
+                    except Exception as error:
+                        outcomes.append((future, None, error))
+        except Exception as error:
+            for _, _, _, future in batch:
+                future.set_exception(error)
+            return
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def _run(self, tasks):
+        self._local.writer = True
+        while True:
+            batch, stopping = self._next_batch(tasks)
+            if batch:
+                self._write(batch)
+            if stopping:
+                connection.close()
+                return
+
+
+write_queue = WriteQueue()
+
+
+def run_write(request, func, *args, **kwargs):
+    """Выполняет изменяющий запрос через поток-писатель.
+
+    Действует только при SERIALIZE_WRITES; безопасные методы и все
+    запросы при выключенной настройке выполняются как обычно.
+    """
+    if request.method in SAFE_METHODS or not settings.SERIALIZE_WRITES:
+        return func(*args, **kwargs)
+    return write_queue.submit(func, *args, **kwargs)
+
+
+def serialized_writes(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        return run_write(request, view, request, *args, **kwargs)
+    return wrapper
+
+
+class SerializedWritesAdminMixin:
+    """Пропускает изменения из админки через поток-писатель."""
+
+    def changeform_view(self, request, *args, **kwargs):
+        return run_write(
+            request, super().changeform_view, request, *args, **kwargs)
+
+    def changelist_view(self, request, *args, **kwargs):
+        return run_write(
+            request, super().changelist_view, request, *args, **kwargs)
+
+    def delete_view(self, request, *args, **kwargs):
+        return run_write(
+            request, super().delete_view, request, *args, **kwargs)
@@ -0,0 +1,20 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'name',
+        'status',
+        'attempts',
+        'run_at',
+        'locked_by',
+        'finished_at',
+    )
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'dedupe_key')
+
+
+admin.site.register(Job, JobAdmin)
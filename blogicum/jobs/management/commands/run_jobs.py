@@ -0,0 +1,34 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from jobs.queue import Worker
+
+
+class Command(BaseCommand):
+    help = ('Выполняет фоновые задачи из очереди. По SIGTERM/SIGINT '
+            'дожидается текущих задач и завершается.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=1,
+            help='Число потоков-обработчиков.')
+        parser.add_argument(
+            '--poll-interval', type=float, default=1.0,
+            help='Пауза между опросами пустой очереди, в секундах.')
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить готовые задачи и выйти.')
+
+    def handle(self, *args, concurrency, poll_interval, once, **options):
+        worker = Worker(concurrency=concurrency, poll_interval=poll_interval)
+        signal.signal(signal.SIGTERM, worker.stop)
+        signal.signal(signal.SIGINT, worker.stop)
+        if once:
+            done = worker.run_pending()
+            self.stdout.write(f'Выполнено задач: {done}')
+            return
+        self.stdout.write(
+            f'Обработчик {worker.name}: потоков {concurrency}')
+        worker.run()
+        self.stdout.write('Обработчик остановлен.')
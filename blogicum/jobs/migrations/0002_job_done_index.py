@@ -0,0 +1,17 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'done')), fields=['finished_at'], name='job_done_idx'),
+        ),
+    ]
@@ -0,0 +1,83 @@
+from django.db import models
+from django.db.models import Q
+
+
+class Job(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (QUEUED, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(max_length=128, verbose_name='Задача')
+    kwargs = models.JSONField(default=dict, verbose_name='Аргументы')
+    status = models.CharField(
+        max_length=16,
+        choices=STATUSES,
+        default=QUEUED,
+        verbose_name='Статус'
+    )
+    run_at = models.DateTimeField(verbose_name='Запустить не раньше')
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток'
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        verbose_name='Максимум попыток'
+    )
+    dedupe_key = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        verbose_name='Ключ уникальности',
+        help_text='Пока задача в очереди, вторая с тем же ключом '
+                  'не создаётся.'
+    )
+    locked_by = models.CharField(
+        max_length=64,
+        blank=True,
+        verbose_name='Обработчик'
+    )
+    locked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Взята в работу'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Создана'
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Завершена'
+    )
+
+    class Meta:
+        verbose_name = 'задача'
+        verbose_name_plural = 'Задачи'
+        indexes = (
+            models.Index(fields=('run_at', 'id'),
+                         condition=Q(status='queued'),
+                         name='job_queued_idx'),
+            models.Index(fields=('locked_at',),
+                         condition=Q(status='running'),
+                         name='job_running_idx'),
+            models.Index(fields=('finished_at',),
+                         condition=Q(status='done'),
+                         name='job_done_idx'),
+        )
+        constraints = (
+            models.UniqueConstraint(fields=('dedupe_key',),
+                                    condition=Q(status='queued'),
+                                    name='job_queued_dedupe_uniq'),
+        )
+
+    def __str__(self):
+        return f'{self.name} #{self.pk} ({self.get_status_display()})'
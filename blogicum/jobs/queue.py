@@ -0,0 +1,209 @@
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from jobs.models import Job
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+def task(name):
+    """Регистрирует функцию как фоновую задачу с именем name."""
+    def decorator(func):
+        registry[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, kwargs=None, *, run_at=None, delay=0, dedupe_key=None,
+            max_attempts=None):
+    """Ставит задачу в очередь в рамках текущей транзакции.
+
+    Если в очереди уже ждёт задача с тем же dedupe_key, новая не
+    создаётся и возвращается существующая.
+    """
+    job = Job(
+        name=name,
+        kwargs=kwargs or {},
+        run_at=run_at or timezone.now() + timedelta(seconds=delay),
+        dedupe_key=dedupe_key,
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+    )
+    if dedupe_key is None:
+        job.save()
+        return job
+    # Сначала запись: транзакция, начатая с чтения, в режиме WAL не может
+    # дождаться блокировки и сразу падает с "database is locked".
+    try:
+        with transaction.atomic():
+            job.save()
+    except IntegrityError:
+        return Job.objects.filter(
+            dedupe_key=dedupe_key, status=Job.QUEUED).first()
+    return job
+
+
+def retry_delay(attempt):
+    """Экспоненциальная задержка перед повтором, со случайным разбросом."""
+    base = settings.JOBS_RETRY_DELAY
+    delay = min(base * 2 ** (attempt - 1), settings.JOBS_RETRY_MAX_DELAY)
+    return timedelta(seconds=delay + random.uniform(0, base))
+
+
+def _requeue(job_id, **changes):
+    """Возвращает задачу в очередь; при дубле в очереди — снимает её."""
+    jobs = Job.objects.filter(pk=job_id)
+    try:
+        with transaction.atomic():
+            return jobs.update(
+                status=Job.QUEUED, locked_by='', locked_at=None, **changes)
+    except IntegrityError:
+        return jobs.update(
+            status=Job.FAILED, finished_at=timezone.now(),
+            last_error='В очереди уже есть такая же задача.')
+
+
+def release_expired():
+    """Возвращает в очередь задачи упавших обработчиков."""
+    deadline = timezone.now() - timedelta(
+        seconds=settings.JOBS_LEASE_TIMEOUT)
+    expired = Job.objects.filter(
+        status=Job.RUNNING, locked_at__lt=deadline
+    ).values_list('pk', flat=True)
+    for job_id in list(expired):
+        _requeue(job_id)
+
+
+def prune_finished(batch_size=1000):
+    """Удаляет выполненные задачи старше JOBS_KEEP_DONE секунд.
+
+    Удаляет пачками, чтобы не держать блокировку записи долго. Задачи
+    с ошибкой остаются для разбора.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.JOBS_KEEP_DONE)
+    finished = Job.objects.filter(status=Job.DONE, finished_at__lt=cutoff)
+    pruned = 0
+    while True:
+        batch = list(finished.values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            return pruned
+        pruned += Job.objects.filter(pk__in=batch).delete()[0]
+
+
+def claim(worker_id, limit=1):
+    """Забирает до limit готовых задач.
+
+    Задача достаётся тому обработчику, чей UPDATE ... WHERE status='queued'
+    изменил строку, поэтому несколько процессов не возьмут одну задачу.
+    """
+    now = timezone.now()
+    candidates = Job.objects.filter(
+        status=Job.QUEUED, run_at__lte=now
+    ).order_by('run_at', 'id').values_list('pk', flat=True)[:limit * 4]
+    claimed = []
+    for job_id in list(candidates):
+        if Job.objects.filter(pk=job_id, status=Job.QUEUED).update(
+                status=Job.RUNNING, locked_by=worker_id, locked_at=now,
+                attempts=F('attempts') + 1):
+            claimed.append(job_id)
+            if len(claimed) == limit:
+                break
+    return list(Job.objects.filter(pk__in=claimed).order_by('run_at', 'id'))
+
+
+def run_job(job, worker_id):
+    own = Job.objects.filter(
+        pk=job.pk, status=Job.RUNNING, locked_by=worker_id)
+    try:
+        func = registry.get(job.name)
+        if func is None:
+            raise LookupError(f'Неизвестная задача: {job.name}')
+        func(**job.kwargs)
+    except Exception:
+        logger.exception('Задача %s завершилась ошибкой', job)
+        error = traceback.format_exc()
+        if not own.exists():
+            return False
+        if job.attempts < job.max_attempts:
+            _requeue(job.pk, last_error=error,
+                     run_at=timezone.now() + retry_delay(job.attempts))
+        else:
+            own.update(status=Job.FAILED, last_error=error,
+                       finished_at=timezone.now())
+        return False
+    own.update(status=Job.DONE, finished_at=timezone.now())
+    return True
+
+
+class Worker:
+    """Обработчик очереди: concurrency потоков, опрашивающих таблицу."""
+
+    def __init__(self, concurrency=1, poll_interval=1.0):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.name = f'{socket.gethostname()}:{os.getpid()}'
+        self.stopping = threading.Event()
+        self.pruned_at = None
+
+    def stop(self, *args):
+        """Просит потоки завершиться после текущих задач."""
+        self.stopping.set()
+
+    def maintain(self):
+        """Возвращает задачи упавших обработчиков и чистит выполненные."""
+        release_expired()
+        now = time.monotonic()
+        if (self.pruned_at is None
+                or now - self.pruned_at >= settings.JOBS_PRUNE_INTERVAL):
+            self.pruned_at = now
+            prune_finished()
+
+    def run_pending(self):
+        """Выполняет все готовые задачи в текущем потоке."""
+        done = 0
+        self.maintain()
+        while not self.stopping.is_set():
+            jobs = claim(self.name)
+            if not jobs:
+                break
+            for job in jobs:
+                run_job(job, self.name)
+                done += 1
+        return done
+
+    def _loop(self, index):
+        worker_id = f'{self.name}/{index}'
+        try:
+            while not self.stopping.is_set():
+                if index == 0:
+                    self.maintain()
+                jobs = claim(worker_id)
+                if not jobs:
+                    self.stopping.wait(self.poll_interval)
+                for job in jobs:
+                    run_job(job, worker_id)
+        finally:
+            connection.close()
+
+    def run(self):
+        threads = [
+            threading.Thread(target=self._loop, args=(index,),
+                             name=f'jobs-{index}')
+            for index in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
@@ -0,0 +1,19 @@
+from django.contrib import admin
+
+from .models import OutboxMessage
+
+
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'subject',
+        'status',
+        'attempts',
+        'created_at',
+        'sent_at',
+    )
+    list_filter = ('status',)
+    search_fields = ('subject',)
+
+
+admin.site.register(OutboxMessage, OutboxMessageAdmin)
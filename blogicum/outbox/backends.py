@@ -0,0 +1,56 @@
+import hashlib
+import json
+
+from django.core.mail.backends.base import BaseEmailBackend
+from django.utils import timezone
+
+from jobs.queue import enqueue
+
+from outbox.models import OutboxMessage
+
+DELIVER_TASK = 'outbox.deliver'
+
+
+def message_to_row(message):
+    if message.attachments:
+        raise ValueError('Исходящая почта не поддерживает вложения.')
+    fields = {
+        'subject': str(message.subject),
+        'body': str(message.body),
+        'from_email': message.from_email,
+        'to': list(message.to),
+        'cc': list(message.cc),
+        'bcc': list(message.bcc),
+        'reply_to': list(message.reply_to),
+        'headers': dict(message.extra_headers),
+        'alternatives': [
+            [str(content), mimetype]
+            for content, mimetype in getattr(message, 'alternatives', ())
+        ],
+    }
+    payload = json.dumps(fields, sort_keys=True, ensure_ascii=False)
+    return OutboxMessage(
+        dedupe_key=hashlib.sha256(payload.encode()).hexdigest(),
+        next_attempt_at=timezone.now(),
+        **fields,
+    )
+
+
+class OutboxBackend(BaseEmailBackend):
+    """Сохраняет письма в OutboxMessage; отправляет их фоновая задача.
+
+    Письмо, точная копия которого ещё ждёт отправки, не дублируется.
+    """
+
+    def send_messages(self, email_messages):
+        try:
+            rows = [message_to_row(message) for message in email_messages]
+            if rows:
+                OutboxMessage.objects.bulk_create(
+                    rows, ignore_conflicts=True)
+                enqueue(DELIVER_TASK, dedupe_key=DELIVER_TASK)
+        except Exception:
+            if not self.fail_silently:
+                raise
+            return 0
+        return len(rows)
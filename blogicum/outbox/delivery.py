@@ -0,0 +1,111 @@
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from jobs.queue import retry_delay
+
+from outbox.models import OutboxMessage
+
+
+def build_message(row, connection):
+    return EmailMultiAlternatives(
+        subject=row.subject,
+        body=row.body,
+        from_email=row.from_email,
+        to=row.to,
+        cc=row.cc,
+        bcc=row.bcc,
+        reply_to=row.reply_to,
+        headers=row.headers,
+        alternatives=[tuple(item) for item in row.alternatives],
+        connection=connection,
+    )
+
+
+def release_expired():
+    """Возвращает в очередь письма, которые отправитель не дослал."""
+    deadline = timezone.now() - timedelta(
+        seconds=settings.JOBS_LEASE_TIMEOUT)
+    expired = OutboxMessage.objects.filter(
+        status=OutboxMessage.SENDING, locked_at__lt=deadline
+    ).values_list('pk', flat=True)
+    for pk in list(expired):
+        rows = OutboxMessage.objects.filter(pk=pk)
+        try:
+            with transaction.atomic():
+                rows.update(status=OutboxMessage.PENDING, locked_by='',
+                            locked_at=None)
+        except IntegrityError:
+            rows.update(status=OutboxMessage.FAILED,
+                        last_error='Такое же письмо уже ждёт отправки.')
+
+
+def claim_batch(size):
+    """Забирает пачку писем одним UPDATE с меткой отправителя."""
+    now = timezone.now()
+    candidates = OutboxMessage.objects.filter(
+        status=OutboxMessage.PENDING, next_attempt_at__lte=now
+    ).order_by('next_attempt_at', 'id').values_list('pk', flat=True)[:size]
+    token = uuid.uuid4().hex
+    OutboxMessage.objects.filter(
+        pk__in=list(candidates), status=OutboxMessage.PENDING
+    ).update(status=OutboxMessage.SENDING, locked_by=token, locked_at=now)
+    return list(OutboxMessage.objects.filter(
+        status=OutboxMessage.SENDING, locked_by=token).order_by('id'))
+
+
+def _fail(row, error):
+    attempts = row.attempts + 1
+    rows = OutboxMessage.objects.filter(pk=row.pk)
+    if attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        rows.update(status=OutboxMessage.FAILED, attempts=attempts,
+                    last_error=error, locked_by='', locked_at=None)
+        return
+    try:
+        with transaction.atomic():
+            rows.update(
+                status=OutboxMessage.PENDING, attempts=attempts,
+                last_error=error, locked_by='', locked_at=None,
+                next_attempt_at=timezone.now() + retry_delay(attempts))
+    except IntegrityError:
+        rows.update(status=OutboxMessage.FAILED, attempts=attempts,
+                    last_error=error, locked_by='', locked_at=None)
+
+
+def deliver_pending(batch_size=None):
+    """Отправляет все готовые письма через одно соединение.
+
+    Возвращает число отправленных и неудавшихся писем.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    release_expired()
+    sent = failed = 0
+    connection = get_connection(settings.OUTBOX_DELIVERY_BACKEND)
+    with connection:
+        while True:
+            batch = claim_batch(batch_size)
+            if not batch:
+                break
+            delivered = []
+            for row in batch:
+                try:
+                    if not connection.send_messages(
+                            [build_message(row, connection)]):
+                        raise RuntimeError('Письмо не принято сервером.')
+                except Exception:
+                    _fail(row, traceback.format_exc())
+                    failed += 1
+                else:
+                    delivered.append(row.pk)
+            # Ошибки прошлых попыток остаются в attempts и last_error.
+            OutboxMessage.objects.filter(pk__in=delivered).update(
+                status=OutboxMessage.SENT, sent_at=timezone.now(),
+                attempts=F('attempts') + 1, locked_by='', locked_at=None)
+            sent += len(delivered)
+    return sent, failed
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from outbox.delivery import deliver_pending
+
+
+class Command(BaseCommand):
+    help = ('Отправляет письма из исходящей почты пачками через одно '
+            'соединение. Запускается периодически (cron) или с --interval.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Сколько писем забирать за раз '
+                 '(по умолчанию OUTBOX_BATCH_SIZE).')
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Повторять каждые N секунд вместо однократного запуска.')
+
+    def handle(self, *args, batch_size=None, interval=0, **options):
+        while True:
+            sent, failed = deliver_pending(batch_size)
+            self.stdout.write(f'Отправлено: {sent}, с ошибкой: {failed}')
+            if not interval:
+                break
+            time.sleep(interval)
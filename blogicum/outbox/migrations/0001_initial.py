@@ -0,0 +1,50 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=998, verbose_name='Тема')),
+                ('body', models.TextField(blank=True, verbose_name='Текст')),
+                ('from_email', models.CharField(max_length=254, verbose_name='От кого')),
+                ('to', models.JSONField(default=list, verbose_name='Кому')),
+                ('cc', models.JSONField(default=list, verbose_name='Копия')),
+                ('bcc', models.JSONField(default=list, verbose_name='Скрытая копия')),
+                ('reply_to', models.JSONField(default=list, verbose_name='Ответить')),
+                ('headers', models.JSONField(default=dict, verbose_name='Заголовки')),
+                ('alternatives', models.JSONField(default=list, verbose_name='Альтернативные версии')),
+                ('dedupe_key', models.CharField(max_length=64, verbose_name='Ключ уникальности')),
+                ('status', models.CharField(choices=[('pending', 'Ждёт отправки'), ('sending', 'Отправляется'), ('sent', 'Отправлено'), ('failed', 'Ошибка')], default='pending', max_length=16, verbose_name='Статус')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попыток')),
+                ('next_attempt_at', models.DateTimeField(verbose_name='Следующая попытка')),
+                ('locked_by', models.CharField(blank=True, max_length=32, verbose_name='Отправитель')),
+                ('locked_at', models.DateTimeField(blank=True, null=True, verbose_name='Взято в отправку')),
+                ('last_error', models.TextField(blank=True, verbose_name='Последняя ошибка')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Отправлено')),
+            ],
+            options={
+                'verbose_name': 'письмо',
+                'verbose_name_plural': 'Исходящие письма',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='outboxmessage',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['next_attempt_at', 'id'], name='outbox_pending_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='outboxmessage',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'pending')), fields=('dedupe_key',), name='outbox_pending_dedupe_uniq'),
+        ),
+    ]
@@ -0,0 +1,82 @@
+from django.db import models
+from django.db.models import Q
+
+
+class OutboxMessage(models.Model):
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'Ждёт отправки'),
+        (SENDING, 'Отправляется'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Ошибка'),
+    )
+
+    subject = models.CharField(max_length=998, verbose_name='Тема')
+    body = models.TextField(blank=True, verbose_name='Текст')
+    from_email = models.CharField(max_length=254, verbose_name='От кого')
+    to = models.JSONField(default=list, verbose_name='Кому')
+    cc = models.JSONField(default=list, verbose_name='Копия')
+    bcc = models.JSONField(default=list, verbose_name='Скрытая копия')
+    reply_to = models.JSONField(default=list, verbose_name='Ответить')
+    headers = models.JSONField(default=dict, verbose_name='Заголовки')
+    alternatives = models.JSONField(
+        default=list,
+        verbose_name='Альтернативные версии'
+    )
+    dedupe_key = models.CharField(
+        max_length=64,
+        verbose_name='Ключ уникальности'
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUSES,
+        default=PENDING,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток'
+    )
+    next_attempt_at = models.DateTimeField(
+        verbose_name='Следующая попытка'
+    )
+    locked_by = models.CharField(
+        max_length=32,
+        blank=True,
+        verbose_name='Отправитель'
+    )
+    locked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Взято в отправку'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Создано'
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Отправлено'
+    )
+
+    class Meta:
+        verbose_name = 'письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = (
+            models.Index(fields=('next_attempt_at', 'id'),
+                         condition=Q(status='pending'),
+                         name='outbox_pending_idx'),
+        )
+        constraints = (
+            models.UniqueConstraint(fields=('dedupe_key',),
+                                    condition=Q(status='pending'),
+                                    name='outbox_pending_dedupe_uniq'),
+        )
+
+    def __str__(self):
+        return f'{self.subject} → {", ".join(self.to)}'
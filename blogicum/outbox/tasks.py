@@ -0,0 +1,9 @@
+from jobs.queue import task
+
+from outbox.backends import DELIVER_TASK
+from outbox.delivery import deliver_pending
+
+
+@task(DELIVER_TASK)
+def deliver():
+    deliver_pending()
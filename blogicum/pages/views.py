@@ -1,11 +1,16 @@
 from django.shortcuts import render
+from django.utils.decorators import method_decorator
 from django.views.generic import TemplateView
 
+from core.conditional import conditional_page, template_validators
 
+
+@method_decorator(conditional_page(template_validators), name='dispatch')
 class About(TemplateView):
     template_name = 'pages/about.html'
 
 
+@method_decorator(conditional_page(template_validators), name='dispatch')
 class Rules(TemplateView):
     template_name = 'pages/rules.html'
 
@@ -20,6 +20,7 @@ from mixer.backend.django import mixer as _mixer
 N_PER_FIXTURE = 3
 N_PER_PAGE = 10
 COMMENT_TEXT_DISPLAY_LEN_FOR_TESTS = 50
+COMMENTS_DB = "comments"
 
 KeyVal = NamedTuple("KeyVal", [("key", Optional[str]), ("val", Optional[str])])
 UrlRepr = NamedTuple("UrlRepr", [("url", str), ("repr", str)])
@@ -32,6 +33,27 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(scope="session")
+def django_db_modify_db_settings(django_db_modify_db_settings_parallel_suffix):
+    """Second database for comments, migrated as with
+    COMMENTS_DATABASE='comments'; the tests themselves keep comments in
+    'default' unless they override the setting."""
+    from django.conf import settings
+
+    settings.DATABASES[COMMENTS_DB] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": settings.BASE_DIR / "comments.sqlite3",
+    }
+    migrating = override_settings(COMMENTS_DATABASE=COMMENTS_DB)
+    migrating.enable()
+    return migrating
+
+
+@pytest.fixture(scope="session")
+def django_db_setup(django_db_setup, django_db_modify_db_settings):
+    django_db_modify_db_settings.disable()
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -0,0 +1,85 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _profile_queries(client, username):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(f'/profile/{username}/')
+    return response, [query['sql'] for query in ctx.captured_queries]
+
+
+def test_profile_resolves_user_once(
+        user_client, many_posts_with_published_locations):
+    username = many_posts_with_published_locations[0].author.username
+    _profile_queries(user_client, username)
+    _, queries = _profile_queries(user_client, username)
+    user_lookups = [
+        sql for sql in queries if '"auth_user"."username" =' in sql]
+    assert len(user_lookups) == 1, (
+        'Убедитесь, что страница профиля ищет пользователя один раз.'
+    )
+    assert not any('COUNT(' in sql or 'MAX(' in sql for sql in queries), (
+        'Убедитесь, что статистика автора берётся из готовой таблицы.'
+    )
+
+
+def test_author_stats_follow_writes(
+        mixer, user, user_client, post_with_published_location):
+    response, _ = _profile_queries(user_client, user.username)
+    stats = response.context['stats']
+    assert (stats.post_count, stats.comment_count) == (1, 0)
+
+    mixer.cycle(2).blend(
+        'blog.Comment', post=post_with_published_location, author=user)
+    mixer.blend('blog.Post', author=user, is_published=False)
+    response, _ = _profile_queries(user_client, user.username)
+    stats = response.context['stats']
+    assert (stats.post_count, stats.published_count,
+            stats.comment_count) == (2, 1, 2), (
+        'Убедитесь, что статистика автора обновляется при записи '
+        'публикаций и комментариев.'
+    )
+    post_with_published_location.delete()
+    stats = user_client.get(f'/profile/{user.username}/').context['stats']
+    assert (stats.post_count, stats.comment_count) == (1, 0)
+
+
+def test_writes_update_stats_without_aggregates(
+        mixer, user, user_client, post_with_published_location):
+    from datetime import timedelta
+
+    from blog.models import AuthorStats
+
+    post = post_with_published_location
+    user_client.get(f'/profile/{user.username}/')
+    with CaptureQueriesContext(connection) as ctx:
+        later = mixer.blend(
+            'blog.Post', author=user,
+            pub_date=post.pub_date + timedelta(days=1))
+        mixer.blend('blog.Comment', post=post, author=user)
+        post.is_published = False
+        post.save()
+    assert not any(
+        'COUNT(' in query['sql'] or 'MAX("blog_post"' in query['sql']
+        for query in ctx.captured_queries), (
+        'Убедитесь, что статистика автора обновляется приращениями, '
+        'без пересчёта по всем публикациям.'
+    )
+    stats = AuthorStats.objects.get(author=user)
+    assert (stats.post_count, stats.published_count,
+            stats.comment_count) == (2, 1, 1)
+    assert stats.last_post_at == later.pub_date, (
+        'Убедитесь, что последняя публикация определяется по дате '
+        'публикации.'
+    )
+    later.delete()
+    stats.refresh_from_db()
+    assert stats.last_post_at == post.pub_date
+    post.pub_date -= timedelta(days=2)
+    post.save()
+    assert AuthorStats.objects.recount() == 0, (
+        'Убедитесь, что приращения совпадают с полным пересчётом.'
+    )
@@ -0,0 +1,23 @@
+import pytest
+from django.core.cache import cache
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_cards_are_reused_until_post_changes(
+        user_client, post_with_published_location):
+    from blog.cache import card_cache_stats
+
+    cache.clear()
+    post = post_with_published_location
+    user_client.get('/')
+    user_client.get(f'/category/{post.category.slug}/')
+    assert card_cache_stats() == {'hits': 1, 'misses': 1}, (
+        'Убедитесь, что карточка публикации рендерится один раз и затем'
+        ' берётся из кеша.'
+    )
+    post.title = 'Новый заголовок'
+    post.save()
+    content = user_client.get('/').content.decode()
+    assert 'Новый заголовок' in content
+    assert card_cache_stats()['misses'] == 2
@@ -0,0 +1,33 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comment_writes(
+        mixer, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend('blog.Comment', post=post)
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        'Убедитесь, что `Post.comment_count` увеличивается при добавлении'
+        ' комментария.'
+    )
+    comments[0].delete()
+    type(comments[0]).objects.filter(pk=comments[1].pk).delete()
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        'Убедитесь, что `Post.comment_count` уменьшается при удалении'
+        ' комментария.'
+    )
+
+
+def test_recount_comments_repairs_drift(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend('blog.Comment', post=post)
+    type(post).objects.filter(pk=post.pk).update(comment_count=7)
+    call_command('recount_comments', stdout=StringIO())
+    post.refresh_from_db()
+    assert post.comment_count == 2
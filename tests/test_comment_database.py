@@ -0,0 +1,93 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_router_keeps_comments_in_their_database(settings):
+    from blog.models import Comment, Post
+    from blog.routers import CommentRouter
+
+    settings.COMMENTS_DATABASE = 'comments'
+    router = CommentRouter()
+    assert router.db_for_read(Comment) == 'comments'
+    assert router.db_for_write(Comment) == 'comments'
+    assert router.db_for_read(Post) is None
+    assert router.allow_migrate('comments', 'blog', model_name='comment')
+    assert not router.allow_migrate('comments', 'blog', model_name='post'), (
+        'Убедитесь, что в базе комментариев создаётся только их таблица.'
+    )
+    assert router.allow_migrate('default', 'blog', model_name='post') is None
+
+
+def test_comments_follow_post_and_author_deletion(
+        mixer, post_with_published_location, another_user):
+    from blog.models import Comment
+
+    post = post_with_published_location
+    mixer.cycle(2).blend('blog.Comment', post=post)
+    other_post = mixer.blend(
+        'blog.Post', author=post.author, category=post.category)
+    mixer.blend('blog.Comment', post=other_post, author=another_user)
+    post.delete()
+    assert list(Comment.objects.values_list('post_id', flat=True)) == [
+        other_post.id
+    ], 'Убедитесь, что комментарии удаляются вместе с публикацией.'
+    another_user.delete()
+    assert not Comment.objects.exists(), (
+        'Убедитесь, что комментарии удаляются вместе с автором.'
+    )
+
+
+@pytest.mark.django_db(databases='__all__')
+def test_comments_live_in_second_database(
+        settings, mixer, post_with_published_location, user_client, user,
+        another_user):
+    from django.db import connections
+    from django.urls import reverse
+
+    from blog.models import Comment
+    from conftest import COMMENTS_DB
+
+    with connections[COMMENTS_DB].cursor() as cursor:
+        tables = connections[COMMENTS_DB].introspection.table_names(cursor)
+    assert 'blog_comment' in tables and 'blog_post' not in tables, (
+        'Убедитесь, что миграции создают в базе комментариев только их '
+        'таблицу.'
+    )
+
+    settings.COMMENTS_DATABASE = COMMENTS_DB
+    post = post_with_published_location
+    user_client.post(
+        reverse('blog:add_comment', args=[post.id]), {'text': 'Первый'})
+    comment = Comment.objects.get()
+    assert comment._state.db == COMMENTS_DB
+    assert not Comment.objects.using('default').exists(), (
+        'Убедитесь, что комментарий сохраняется в COMMENTS_DATABASE.'
+    )
+    post.refresh_from_db()
+    assert post.comment_count == 1
+
+    detail = user_client.get(reverse('blog:post_detail', args=[post.id]))
+    assert 'Первый' in detail.content.decode('utf-8')
+    assert user_client.get(
+        reverse('blog:profile', args=[user.username])).status_code == 200
+
+    user_client.post(
+        reverse('blog:edit_comment', args=[post.id, comment.id]),
+        {'text': 'Исправленный'})
+    comment.refresh_from_db()
+    assert comment.text == 'Исправленный'
+    user_client.post(
+        reverse('blog:delete_comment', args=[post.id, comment.id]))
+    assert not Comment.objects.exists()
+
+    mixer.blend('blog.Comment', post=post, author=another_user)
+    mixer.blend('blog.Comment', post=post, author=user)
+    another_user.delete()
+    assert list(Comment.objects.values_list('author_id', flat=True)) == [
+        user.id
+    ], 'Убедитесь, что комментарии удаляются вместе с автором.'
+    post.delete()
+    assert not Comment.objects.exists(), (
+        'Убедитесь, что комментарии удаляются вместе с публикацией.'
+    )
@@ -0,0 +1,50 @@
+import pytest
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comments_are_sent_as_one_digest(
+        mixer, user_client, another_user_client, published_category,
+        published_locations):
+    from blog.models import CommentNotification
+    from blog.notifications import send_comment_digests
+    from jobs.models import Job
+
+    author = mixer.blend('auth.User', email='author@blogicum.not')
+    posts = mixer.cycle(2).blend(
+        'blog.Post', author=author, category=published_category,
+        location=published_locations[0])
+    for client in (user_client, user_client, another_user_client):
+        client.post(f'/posts/{posts[0].id}/comment/', {'text': 'Текст'})
+    user_client.post(f'/posts/{posts[1].id}/comment/', {'text': 'Текст'})
+    assert not mail.outbox, (
+        'Убедитесь, что уведомление не отправляется сразу после комментария.'
+    )
+    assert Job.objects.filter(name='blog.send_comment_digests').count() == 1
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert send_comment_digests() == 1
+    grouped = [q for q in ctx.captured_queries if 'GROUP BY' in q['sql']]
+    assert len(grouped) == 1, (
+        'Убедитесь, что уведомления сворачиваются одним запросом.'
+    )
+    assert len(mail.outbox) == 1
+    digest = mail.outbox[0]
+    assert digest.to == ['author@blogicum.not']
+    assert f'«{posts[0].title}» — новых комментариев: 3' in digest.body
+    assert f'«{posts[1].title}» — новых комментариев: 1' in digest.body
+    assert not CommentNotification.objects.exists()
+
+
+def test_own_comment_is_not_notified(user_client, post_with_published_location):
+    from blog.models import CommentNotification
+
+    user_client.post(
+        f'/posts/{post_with_published_location.id}/comment/',
+        {'text': 'Текст'})
+    assert not CommentNotification.objects.exists(), (
+        'Убедитесь, что автор не получает уведомлений о своих комментариях.'
+    )
@@ -0,0 +1,36 @@
+from http import HTTPStatus
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+def revalidate(client, url, response):
+    return client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+
+@pytest.mark.parametrize('url', ['/', '/pages/about/'])
+def test_unchanged_page_returns_304(user_client, url,
+                                    post_with_published_location):
+    response = user_client.get(url)
+    assert response.has_header('ETag') and response.has_header(
+        'Last-Modified')
+    assert revalidate(user_client, url, response).status_code == (
+        HTTPStatus.NOT_MODIFIED), (
+        f'Убедитесь, что страница {url} отвечает 304, если не изменилась.'
+    )
+
+
+def test_validators_follow_changes(
+        mixer, user_client, another_user_client, post_with_published_location):
+    post = post_with_published_location
+    for url in ('/', f'/posts/{post.id}/', f'/category/{post.category.slug}/',
+                f'/profile/{post.author.username}/'):
+        response = user_client.get(url)
+        mixer.blend('blog.Comment', post=post)
+        assert revalidate(user_client, url, response).status_code == (
+            HTTPStatus.OK), (
+            f'Убедитесь, что новый комментарий меняет ETag страницы {url}.'
+        )
+        assert revalidate(another_user_client, url, response).status_code == (
+            HTTPStatus.OK)
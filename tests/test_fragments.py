@@ -0,0 +1,77 @@
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def esi_mode():
+    cache.clear()
+    with override_settings(PAGE_FRAGMENTS='esi'):
+        yield
+    cache.clear()
+
+
+def test_shell_is_shared_between_users(
+        user_client, another_user, another_user_client,
+        post_with_published_location):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    edit_url = f'/posts/{post.id}/edit/'
+
+    response = user_client.get(url)
+    content = response.content.decode()
+    assert response['X-Page-Cache'] == 'miss'
+    assert '<esi:include' not in content
+    assert edit_url in content and 'csrfmiddlewaretoken' in content
+
+    response = another_user_client.get(url)
+    content = response.content.decode()
+    assert response['X-Page-Cache'] == 'hit', (
+        'Убедитесь, что в режиме ESI оболочка страницы общая для всех'
+        ' пользователей.'
+    )
+    assert edit_url not in content, (
+        'Убедитесь, что ссылки редактирования видит только автор поста.'
+    )
+    assert f'>{another_user.username}</a>' in content
+
+
+def test_surrogate_assembles_fragments(
+        user_client, post_with_published_location):
+    response = user_client.get(
+        f'/posts/{post_with_published_location.id}/',
+        HTTP_SURROGATE_CAPABILITY='edge="ESI/1.0"',
+    )
+    assert b'<esi:include src="/fragments/user_nav/"/>' in response.content
+    assert response['Surrogate-Control'] == 'content="ESI/1.0"'
+
+
+def test_author_draft_is_not_shared(
+        user_client, unlogged_client, post_with_published_location):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    for url in (f'/posts/{post.id}/', f'/posts/{post.id}/comments/'):
+        assert user_client.get(url).status_code == 200
+        assert unlogged_client.get(url).status_code == 404, (
+            'Убедитесь, что страница скрытой публикации, открытая автором,'
+            ' не попадает в общий кеш.'
+        )
+
+
+def test_revalidation_is_per_user(
+        user_client, another_user_client, unlogged_client,
+        post_with_published_location):
+    url = f'/posts/{post_with_published_location.id}/'
+    etag = user_client.get(url)['ETag']
+    assert user_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    for client in (another_user_client, unlogged_client):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Убедитесь, что ETag страницы с личными фрагментами '
+            'не подходит другим пользователям.'
+        )
+        assert response['X-Page-Cache'] == 'hit'
+        assert not response.has_header('Last-Modified')
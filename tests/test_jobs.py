@@ -0,0 +1,95 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+calls = []
+
+
+@pytest.fixture
+def flaky_task():
+    from jobs.queue import registry, task
+
+    calls.clear()
+
+    @task('tests.flaky')
+    def flaky(fail_times=0):
+        calls.append(fail_times)
+        if len(calls) <= fail_times:
+            raise RuntimeError('сбой')
+
+    yield 'tests.flaky'
+    registry.pop('tests.flaky')
+
+
+def test_enqueue_dedupes_queued_jobs(flaky_task):
+    from jobs.queue import enqueue
+
+    first = enqueue(flaky_task, dedupe_key='same')
+    assert enqueue(flaky_task, dedupe_key='same').pk == first.pk, (
+        'Убедитесь, что задача с тем же ключом не дублируется в очереди.'
+    )
+    assert enqueue(flaky_task, dedupe_key='other').pk != first.pk
+
+
+def test_job_is_claimed_by_one_worker(flaky_task):
+    from jobs.queue import claim, enqueue
+
+    enqueue(flaky_task)
+    assert len(claim('first')) == 1
+    assert claim('second') == [], (
+        'Убедитесь, что задачу не могут забрать два обработчика.'
+    )
+
+
+def test_delayed_job_waits_for_run_at(flaky_task):
+    from jobs.models import Job
+    from jobs.queue import Worker, enqueue
+
+    job = enqueue(flaky_task, delay=60)
+    assert Worker().run_pending() == 0
+    Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+    assert Worker().run_pending() == 1
+    job.refresh_from_db()
+    assert job.status == Job.DONE
+
+
+def test_failed_job_is_retried_with_backoff(settings, flaky_task):
+    from jobs.models import Job
+    from jobs.queue import Worker, enqueue
+
+    settings.JOBS_RETRY_DELAY = 10
+    job = enqueue(flaky_task, {'fail_times': 1}, max_attempts=2)
+    before = timezone.now()
+    Worker().run_pending()
+    job.refresh_from_db()
+    assert job.status == Job.QUEUED and 'сбой' in job.last_error
+    assert job.run_at >= before + timedelta(seconds=10), (
+        'Убедитесь, что повтор откладывается с задержкой.'
+    )
+
+    Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+    Worker().run_pending()
+    job.refresh_from_db()
+    assert (job.status, job.attempts, len(calls)) == (Job.DONE, 2, 2)
+
+
+def test_old_done_jobs_are_pruned(settings, flaky_task):
+    from jobs.models import Job
+    from jobs.queue import enqueue, prune_finished
+
+    settings.JOBS_KEEP_DONE = 60
+    old, recent, failed = (enqueue(flaky_task) for _ in range(3))
+    long_ago = timezone.now() - timedelta(seconds=120)
+    Job.objects.filter(pk__in=[old.pk, recent.pk]).update(
+        status=Job.DONE, finished_at=long_ago)
+    Job.objects.filter(pk=recent.pk).update(finished_at=timezone.now())
+    Job.objects.filter(pk=failed.pk).update(
+        status=Job.FAILED, finished_at=long_ago)
+    assert prune_finished(batch_size=1) == 1
+    assert set(Job.objects.values_list('pk', flat=True)) == {
+        recent.pk, failed.pk}, (
+        'Убедитесь, что удаляются только давно выполненные задачи.'
+    )
@@ -0,0 +1,100 @@
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.db.models import F
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def outbox_settings(settings):
+    settings.EMAIL_BACKEND = 'outbox.backends.OutboxBackend'
+    settings.OUTBOX_DELIVERY_BACKEND = (
+        'django.core.mail.backends.locmem.EmailBackend')
+    settings.OUTBOX_MAX_ATTEMPTS = 2
+    return settings
+
+
+def send(subject='Тема', to='reader@blogicum.not'):
+    mail.send_mail(subject, 'Текст', 'blog@blogicum.not', [to])
+
+
+def test_send_mail_is_stored_not_sent(outbox_settings):
+    from jobs.models import Job
+    from outbox.models import OutboxMessage
+
+    send()
+    send()
+    assert not mail.outbox, (
+        'Убедитесь, что письмо не отправляется во время запроса.'
+    )
+    assert OutboxMessage.objects.count() == 1, (
+        'Убедитесь, что одинаковое письмо не дублируется в исходящих.'
+    )
+    assert Job.objects.filter(name='outbox.deliver').count() == 1, (
+        'Убедитесь, что для отправки ставится одна фоновая задача.'
+    )
+
+
+def test_worker_delivers_batch(outbox_settings):
+    from jobs.queue import Worker
+    from outbox.models import OutboxMessage
+
+    for index in range(3):
+        send(to=f'reader{index}@blogicum.not')
+    Worker().run_pending()
+    assert sorted(message.to[0] for message in mail.outbox) == [
+        f'reader{index}@blogicum.not' for index in range(3)
+    ]
+    assert set(OutboxMessage.objects.values_list('status', flat=True)) == {
+        OutboxMessage.SENT
+    }, 'Убедитесь, что отправленные письма помечаются как отправленные.'
+    send(to='reader0@blogicum.not')
+    assert OutboxMessage.objects.count() == 4, (
+        'Убедитесь, что уже отправленное письмо можно отправить повторно.'
+    )
+
+
+def test_failed_delivery_is_retried_then_failed(
+        outbox_settings, monkeypatch):
+    from outbox.delivery import deliver_pending
+    from outbox.models import OutboxMessage
+
+    def broken(self, messages):
+        raise ConnectionError('сервер недоступен')
+
+    monkeypatch.setattr(EmailBackend, 'send_messages', broken)
+    send()
+    assert deliver_pending() == (0, 1)
+    message = OutboxMessage.objects.get()
+    assert message.status == OutboxMessage.PENDING
+    assert message.attempts == 1
+    assert 'сервер недоступен' in message.last_error
+    OutboxMessage.objects.update(next_attempt_at=message.created_at)
+    deliver_pending()
+    message.refresh_from_db()
+    assert message.status == OutboxMessage.FAILED, (
+        'Убедитесь, что после OUTBOX_MAX_ATTEMPTS попыток письмо '
+        'помечается как неотправленное.'
+    )
+
+
+def test_sent_message_keeps_retry_history(outbox_settings, monkeypatch):
+    from outbox.delivery import deliver_pending
+    from outbox.models import OutboxMessage
+
+    def broken(self, messages):
+        raise ConnectionError('сервер недоступен')
+
+    outbox_settings.OUTBOX_MAX_ATTEMPTS = 3
+    send()
+    with monkeypatch.context() as patch:
+        patch.setattr(EmailBackend, 'send_messages', broken)
+        deliver_pending()
+    OutboxMessage.objects.update(next_attempt_at=F('created_at'))
+    assert deliver_pending() == (1, 0)
+    message = OutboxMessage.objects.get()
+    assert (message.status, message.attempts) == (OutboxMessage.SENT, 2), (
+        'Убедитесь, что после отправки сохраняется число попыток.'
+    )
+    assert 'сервер недоступен' in message.last_error
@@ -0,0 +1,38 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _object_fetches(client, url, table):
+    with CaptureQueriesContext(connection) as ctx:
+        client.get(url)
+    return [
+        query['sql'] for query in ctx.captured_queries
+        if query['sql'].startswith('SELECT')
+        and f'FROM "{table}" WHERE "{table}"."id" =' in query['sql']
+    ]
+
+
+def test_edit_and_delete_load_object_once(
+        mixer, user, user_client, another_user_client,
+        post_with_published_location):
+    post = post_with_published_location
+    comment = mixer.blend('blog.Comment', post=post, author=user)
+    urls = {
+        f'/posts/{post.id}/edit/': 'blog_post',
+        f'/posts/{post.id}/delete/': 'blog_post',
+        f'/posts/{post.id}/edit_comment/{comment.id}/': 'blog_comment',
+        f'/posts/{post.id}/delete_comment/{comment.id}/': 'blog_comment',
+    }
+    for url, table in urls.items():
+        for client in (user_client, another_user_client):
+            fetches = _object_fetches(client, url, table)
+            assert len(fetches) == 1, (
+                f'Убедитесь, что страница {url} загружает объект '
+                'одним запросом и для автора, и для другого пользователя.'
+            )
+            assert 'JOIN' not in fetches[0], (
+                'Для проверки авторства достаточно поля author_id.'
+            )
@@ -0,0 +1,63 @@
+import pytest
+from django.core.cache import cache
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def cache_status(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.get('X-Page-Cache')
+
+
+def test_anonymous_pages_are_cached(
+        client, user_client, post_with_published_location):
+    post = post_with_published_location
+    urls = ('/', f'/posts/{post.id}/', f'/category/{post.category.slug}/',
+            f'/profile/{post.author.username}/')
+    for url in urls:
+        assert cache_status(client, url) == 'miss'
+        assert cache_status(client, url) == 'hit', (
+            f'Убедитесь, что страница {url} кешируется для анонимов.'
+        )
+        assert cache_status(user_client, url) is None
+
+
+def test_comment_invalidates_only_related_pages(
+        mixer, client, post_with_published_location, another_category):
+    post = post_with_published_location
+    other = mixer.blend('blog.Post', category=another_category)
+    urls = ('/', f'/posts/{post.id}/', f'/posts/{other.id}/')
+    for url in urls:
+        cache_status(client, url)
+    mixer.blend('blog.Comment', post=post)
+    assert cache_status(client, '/') == 'miss'
+    assert cache_status(client, f'/posts/{post.id}/') == 'miss'
+    assert cache_status(client, f'/posts/{other.id}/') == 'hit', (
+        'Убедитесь, что новый комментарий не сбрасывает кеш страниц'
+        ' других публикаций.'
+    )
+
+
+def test_cache_hit_answers_conditional_get_without_queries(
+        client, django_assert_num_queries, post_with_published_location):
+    post = post_with_published_location
+    for url in ('/', f'/posts/{post.id}/', f'/category/{post.category.slug}/',
+                f'/profile/{post.author.username}/'):
+        etag = client.get(url)['ETag']
+        with django_assert_num_queries(0):
+            response = client.get(url)
+            assert response['X-Page-Cache'] == 'hit'
+            assert response['ETag'] == etag
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 304, (
+                f'Убедитесь, что страница {url} из кеша отвечает 304'
+                ' без запросов к базе.'
+            )
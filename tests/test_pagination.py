@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _walk(client, url, direction='next'):
+    pages = []
+    response = client.get(url)
+    while True:
+        assert response.status_code == HTTPStatus.OK
+        page_obj = response.context['page_obj']
+        pages.append([post.id for post in page_obj])
+        cursor = getattr(page_obj, f'{direction}_cursor')
+        if cursor is None:
+            return pages, page_obj
+        response = client.get(url, {'cursor': cursor})
+
+
+def test_cursor_pagination_walks_feed(
+        user_client, many_posts_with_published_locations):
+    posts = many_posts_with_published_locations
+    expected = [
+        post.id for post in sorted(
+            posts, key=lambda post: (post.pub_date, post.id), reverse=True)
+    ]
+    for url in ('/', f'/profile/{posts[0].author.username}/',
+                f'/category/{posts[0].category.slug}/'):
+        pages, last_page = _walk(user_client, url)
+        assert [pk for page in pages for pk in page] == expected, (
+            'Убедитесь, что курсорная пагинация выдаёт все публикации '
+            'по одному разу, «от новых к старым».'
+        )
+        assert all(len(page) <= N_PER_PAGE for page in pages)
+
+        back = user_client.get(url, {'cursor': last_page.previous_cursor})
+        assert [post.id for post in back.context['page_obj']] == pages[-2], (
+            'Убедитесь, что ссылка на предыдущую страницу '
+            'возвращает к предыдущей порции публикаций.'
+        )
+
+
+def test_numeric_pages_are_capped(
+        user_client, many_posts_with_published_locations):
+    from blog.paginators import MAX_PAGE_DEPTH
+
+    response = user_client.get('/', {'page': 2})
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.context['page_obj']) == N_PER_PAGE
+    response = user_client.get('/', {'page': MAX_PAGE_DEPTH + 1})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    response = user_client.get('/', {'cursor': 'garbage'})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_cursor_keeps_microseconds():
+    from datetime import datetime, timezone
+
+    from blog.paginators import decode_cursor, encode_cursor
+
+    moment = datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc)
+    values, direction = decode_cursor(encode_cursor([moment, 7], 'next'))
+    assert values == [moment.isoformat(), 7] and direction == 'next', (
+        'Убедитесь, что курсор сохраняет дату публикации с точностью '
+        'до микросекунд.'
+    )
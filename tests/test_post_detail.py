@@ -0,0 +1,40 @@
+import pytest
+from bs4 import BeautifulSoup
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_detail_fetches_post_once(user_client, post_with_published_location):
+    post = post_with_published_location
+    with CaptureQueriesContext(connection) as ctx:
+        user_client.get(f'/posts/{post.id}/')
+    post_fetches = [
+        query for query in ctx.captured_queries
+        if query['sql'].startswith('SELECT')
+        and '"blog_post"."text"' in query['sql']
+    ]
+    assert len(post_fetches) == 1, (
+        'Убедитесь, что страница поста загружает публикацию одним запросом.'
+    )
+
+
+def test_comments_are_loaded_in_chunks(
+        mixer, unlogged_client, post_with_published_location):
+    from blog.views import COMMENTS_PER_PAGE
+
+    post = post_with_published_location
+    comments = mixer.cycle(COMMENTS_PER_PAGE + 5).blend(
+        'blog.Comment', post=post)
+    response = unlogged_client.get(f'/posts/{post.id}/')
+    page = response.context['comments']
+    assert len(page) == COMMENTS_PER_PAGE and page.has_next()
+
+    more = BeautifulSoup(response.content, 'html.parser').select_one(
+        'a.comments-more')['href']
+    rest = unlogged_client.get(more).context['comments']
+    assert [comment.id for comment in list(page) + list(rest)] == [
+        comment.id for comment in comments
+    ], 'Убедитесь, что «Показать ещё» догружает оставшиеся комментарии.'
+    assert not rest.has_next()
@@ -0,0 +1,49 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='EXPLAIN QUERY PLAN — SQLite'),
+]
+
+FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$')
+TEMP_SORT = 'USE TEMP B-TREE'
+
+
+def query_plan(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def assert_indexed(client, url, params=None):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url, params or {})
+    assert response.status_code == 200, url
+    for query in ctx.captured_queries:
+        sql = query['sql']
+        if not sql.startswith('SELECT') or '"blog_' not in sql:
+            continue
+        for step in query_plan(sql):
+            assert not FULL_SCAN.match(step) and TEMP_SORT not in step, (
+                f'Запрос страницы {url} не использует индекс ({step}):\n{sql}'
+            )
+    return response
+
+
+def test_views_use_indexes(
+        mixer, user_client, many_posts_with_published_locations):
+    posts = many_posts_with_published_locations
+    post = posts[0]
+    mixer.cycle(3).blend('blog.Comment', post=post)
+    for url in ('/', f'/category/{post.category.slug}/',
+                f'/profile/{post.author.username}/', f'/posts/{post.id}/'):
+        response = assert_indexed(user_client, url)
+        page_obj = response.context.get('page_obj')
+        if page_obj is not None and page_obj.has_next():
+            assert_indexed(
+                user_client, url, {'cursor': page_obj.next_cursor})
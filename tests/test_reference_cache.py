@@ -0,0 +1,98 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+REFERENCE_TABLES = ('"blog_category"', '"blog_location"')
+
+
+def _reference_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    return response, [
+        query['sql'] for query in ctx.captured_queries
+        if any(table in query['sql'] for table in REFERENCE_TABLES)
+    ]
+
+
+def test_feeds_take_references_from_memory(
+        user_client, many_posts_with_published_locations):
+    post = many_posts_with_published_locations[0]
+    urls = ('/', f'/category/{post.category.slug}/',
+            f'/profile/{post.author.username}/', f'/posts/{post.id}/')
+    for url in urls:
+        _, queries = _reference_queries(user_client, url)
+        assert not any('JOIN' in sql for sql in queries), (
+            f'Убедитесь, что страница {url} не присоединяет категории '
+            'и местоположения через JOIN.'
+        )
+    for url in urls:
+        _, queries = _reference_queries(user_client, url)
+        assert not queries, (
+            f'Убедитесь, что страница {url} берёт категории '
+            'и местоположения из памяти процесса.'
+        )
+
+
+def test_reference_change_invalidates_cache(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    url = f'/category/{post.category.slug}/'
+    user_client.get(url)
+    post.location.name = 'Новое место'
+    post.location.save()
+    response, queries = _reference_queries(user_client, url)
+    assert queries and 'Новое место' in response.content.decode(), (
+        'Убедитесь, что изменение местоположения сбрасывает кеш справочников.'
+    )
+    post.category.is_published = False
+    post.category.save()
+    assert user_client.get(url).status_code == 404
+
+
+def test_change_in_another_process_invalidates_cache(
+        monkeypatch, user_client, post_with_published_location):
+    from django.conf import settings
+    from django.core.cache.backends.filebased import FileBasedCache
+    from django.utils import timezone
+
+    from blog import cache
+    from blog.cache import bump
+    from blog.models import Location
+    from blog.references import REFERENCE_GENERATION
+
+    post = post_with_published_location
+    url = f'/category/{post.category.slug}/'
+    user_client.get(url)
+    Location.objects.filter(pk=post.location_id).update(
+        name='Новое место', updated_at=timezone.now())
+    # Отдельный экземпляр бэкенда изображает другой процесс сервера.
+    other_process = FileBasedCache(
+        settings.CACHES['generations']['LOCATION'], {})
+    with monkeypatch.context() as patch:
+        patch.setattr(cache, '_generations', lambda: other_process)
+        bump(REFERENCE_GENERATION)
+    response, queries = _reference_queries(user_client, url)
+    assert queries and 'Новое место' in response.content.decode(), (
+        'Убедитесь, что изменение справочника в другом процессе '
+        'сбрасывает кеш справочников этого процесса.'
+    )
+
+
+def test_generations_are_not_evicted():
+    from django.core.cache import caches
+
+    from blog.cache import bump, get_generations
+    from blog.references import REFERENCE_GENERATION
+
+    reference = get_generations([REFERENCE_GENERATION])
+    names = [f'post:{index}' for index in range(400)]
+    for name in names:
+        bump(name)
+    assert caches['generations'].get_many(
+        [f'gen:{name}' for name in names]).keys() == {
+            f'gen:{name}' for name in names}, (
+        'Убедитесь, что поколения не вытесняются из общего кеша.'
+    )
+    assert get_generations([REFERENCE_GENERATION]) == reference
@@ -0,0 +1,36 @@
+import pytest
+from django.db import connection
+from django.template.defaultfilters import linebreaksbr, truncatewords
+from django.test.utils import CaptureQueriesContext
+from django.utils.html import escape
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_rendered_text_is_stored_on_save(post_with_published_location):
+    post = post_with_published_location
+    post.text = '<b>Раз</b> два\n' + ' '.join(['слово'] * 20)
+    post.save(update_fields=['text'])
+    post.refresh_from_db()
+    assert post.excerpt == truncatewords(post.text, 10)
+    assert post.text_html == linebreaksbr(post.text, autoescape=True), (
+        'Убедитесь, что HTML текста пересчитывается при сохранении поста.'
+    )
+
+
+def test_feeds_do_not_load_post_text(
+        user_client, many_posts_with_published_locations):
+    post = many_posts_with_published_locations[0]
+    for url in ('/', f'/category/{post.category.slug}/',
+                f'/profile/{post.author.username}/'):
+        with CaptureQueriesContext(connection) as ctx:
+            response = user_client.get(url)
+        content = response.content.decode()
+        assert all(
+            escape(item.excerpt) in content
+            for item in response.context['page_obj']
+        )
+        assert not any(
+            '"blog_post"."text"' in query['sql']
+            for query in ctx.captured_queries
+        ), f'Убедитесь, что лента {url} не загружает полный текст постов.'
@@ -0,0 +1,93 @@
+from io import BytesIO
+
+import pytest
+from bs4 import BeautifulSoup
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _upload(width, height, **params):
+    data = BytesIO()
+    Image.new('RGB', (width, height)).save(data, 'JPEG', **params)
+    return SimpleUploadedFile(
+        'photo.jpg', data.getvalue(), content_type='image/jpeg')
+
+
+def test_renditions_are_used_in_templates(
+        user_client, post_with_published_location):
+    from jobs.queue import Worker
+
+    post = post_with_published_location
+    exif = Image.Exif()
+    exif[0x010f] = 'Camera'
+    post.image = _upload(2000, 1000, exif=exif)
+    post.save()
+    Worker().run_pending()
+    expected = {
+        'original': (2000, 1000),
+        'card': (640, 320), 'card_2x': (1280, 640),
+        'detail': (960, 480), 'detail_2x': (1920, 960),
+    }
+    for mime_type in ('image/jpeg', 'image/webp'):
+        sizes = {
+            item.name: (item.width, item.height)
+            for item in post.renditions.filter(mime_type=mime_type)
+        }
+        assert sizes == expected, (
+            f'Убедитесь, что для картинки создаются все размеры {mime_type}.'
+        )
+    webp = post.renditions.get(name='original', mime_type='image/webp')
+    with Image.open(webp.image.path) as image:
+        assert not image.getexif(), 'Уберите метаданные EXIF из WebP.'
+
+    for url, width in (('/', '640'), (f'/posts/{post.id}/', '960')):
+        content = user_client.get(url).content.decode()
+        img = BeautifulSoup(content, 'html.parser').select_one('img[srcset]')
+        assert img is not None and img['width'] == width, (
+            f'Убедитесь, что страница {url} выводит уменьшенную картинку '
+            'с размерами и srcset.'
+        )
+        assert img['src'] != post.image.url
+        assert img.find_parent('picture').select_one(
+            'source[type="image/webp"]'), (
+            f'Убедитесь, что страница {url} предлагает WebP в <picture>.'
+        )
+
+    url = f'/posts/{post.id}/image/card/'
+    webp = user_client.get(url, HTTP_ACCEPT='image/webp,image/*;q=0.8')
+    jpeg = user_client.get(url, HTTP_ACCEPT='image/webp;q=0,image/*')
+    assert webp['Location'].endswith('.webp')
+    assert jpeg['Location'].endswith('.jpg')
+    assert 'Accept' in webp['Vary'], (
+        'Убедитесь, что выбор формата учитывает заголовок Accept.'
+    )
+
+
+def test_large_upload_is_downscaled(settings, post_with_published_location):
+    settings.POST_IMAGE_PIXEL_BUDGET = 1000 * 500
+    post = post_with_published_location
+    post.image = _upload(2000, 1000)
+    post.save()
+    with Image.open(post.image.path) as stored:
+        assert stored.size == (1000, 500), (
+            'Убедитесь, что слишком большие картинки уменьшаются '
+            'при сохранении.'
+        )
+
+
+def test_renditions_are_scheduled_only_for_new_images(mixer, user):
+    from jobs.models import Job
+
+    post = mixer.blend('blog.Post', author=user, image=None)
+    post.title = 'Новый заголовок'
+    post.save()
+    assert not Job.objects.exists(), (
+        'Убедитесь, что сохранение без новой картинки не ставит задачу.'
+    )
+    post.image = _upload(100, 50)
+    post.save()
+    post.text = 'Новый текст'
+    post.save()
+    assert Job.objects.filter(name='blog.generate_renditions').count() == 1
@@ -0,0 +1,93 @@
+import time
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def replica_choices(settings, monkeypatch):
+    """Реплика — та же тестовая база; считаем обращения к репликам."""
+    from core import replicas
+
+    settings.DATABASE_REPLICAS = ['default']
+    replicas.mark_synced('default', time.time())
+    calls = []
+
+    def choice(aliases):
+        calls.append(aliases)
+        return aliases[0]
+
+    monkeypatch.setattr(replicas.random, 'choice', choice)
+    return calls
+
+
+def test_router_sends_only_blog_reads_to_replicas(settings):
+    from core.replicas import ReplicaRouter, replica_reads_enabled
+
+    from blog.models import Post, User
+
+    settings.DATABASE_REPLICAS = ['replica']
+    router = ReplicaRouter()
+    assert router.db_for_read(Post) == 'default'
+    with replica_reads_enabled(['replica']):
+        assert router.db_for_read(Post) == 'replica'
+        assert router.db_for_read(User) == 'default', (
+            'Убедитесь, что пользователи и сессии читаются из основной базы.'
+        )
+        assert router.db_for_write(Post) == 'default'
+    assert router.allow_migrate('replica', 'blog') is False
+
+
+def test_reads_stick_to_primary_after_write(
+        replica_choices, user_client, post_with_published_location):
+    post = post_with_published_location
+    user_client.get(f'/posts/{post.id}/')
+    assert replica_choices, 'Убедитесь, что страница поста читает из реплики.'
+
+    response = user_client.post(
+        f'/posts/{post.id}/comment/', {'text': 'Текст'})
+    assert 'primary_reads' in response.cookies, (
+        'Убедитесь, что после записи ставится cookie привязки к основной '
+        'базе.'
+    )
+    replica_choices.clear()
+    user_client.get(f'/posts/{post.id}/')
+    user_client.get('/')
+    assert not replica_choices, (
+        'Убедитесь, что после записи пользователь читает из основной базы.'
+    )
+
+
+def test_invalid_write_does_not_stick(
+        replica_choices, user_client, post_with_published_location):
+    response = user_client.post(
+        f'/posts/{post_with_published_location.id}/comment/', {'text': ''})
+    assert 'primary_reads' not in response.cookies, (
+        'Убедитесь, что запрос, который ничего не записал, не привязывает '
+        'пользователя к основной базе.'
+    )
+
+
+def test_stale_replica_is_not_read(
+        settings, replica_choices, user_client, post_with_published_location):
+    from core.replicas import mark_synced
+
+    mark_synced('default', time.time() - settings.REPLICA_MAX_LAG - 1)
+    user_client.get(f'/posts/{post_with_published_location.id}/')
+    assert not replica_choices, (
+        'Убедитесь, что реплика старше REPLICA_MAX_LAG не читается.'
+    )
+
+
+def test_page_cache_is_filled_from_primary(
+        replica_choices, client, post_with_published_location):
+    from django.core.cache import cache
+
+    cache.clear()
+    response = client.get(f'/posts/{post_with_published_location.id}/')
+    assert response['X-Page-Cache'] == 'miss'
+    assert not replica_choices, (
+        'Убедитесь, что страница для общего кеша читается из основной базы.'
+    )
+    cache.clear()
@@ -0,0 +1,78 @@
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(connection.vendor != 'sqlite', reason='FTS5 — SQLite'),
+]
+
+
+@pytest.fixture
+def blend_post(mixer, user, published_category):
+    def blend(**kwargs):
+        kwargs.setdefault('is_published', True)
+        return mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            pub_date=timezone.now() - timezone.timedelta(days=1), **kwargs)
+    return blend
+
+
+def found_ids(client, query, cursor=None):
+    params = {'q': query}
+    if cursor:
+        params['cursor'] = cursor
+    response = client.get('/search/', params)
+    assert response.status_code == 200
+    page_obj = response.context['page_obj']
+    return [post.id for post in page_obj], page_obj
+
+
+def test_search_ranks_visible_posts(client, blend_post):
+    strong = blend_post(title='Байкал зимой', text='Байкал, лёд и Байкал')
+    weak = blend_post(title='Путешествия', text='Однажды мы видели Байкал')
+    blend_post(title='Байкал', text='Черновик', is_published=False)
+    blend_post(title='Горы', text='Ничего общего')
+    ids, _ = found_ids(client, 'байк')
+    assert ids == [strong.id, weak.id], (
+        'Убедитесь, что поиск находит видимые публикации по началу слова '
+        'и сортирует их по релевантности.'
+    )
+
+
+def test_search_index_follows_edits(client, blend_post):
+    post = blend_post(title='Старое название', text='Текст')
+    post.title = 'Новое название'
+    post.save()
+    assert found_ids(client, 'старое')[0] == []
+    assert found_ids(client, 'новое')[0] == [post.id]
+    post.delete()
+    assert found_ids(client, 'новое')[0] == [], (
+        'Убедитесь, что индекс поиска обновляется при изменении публикаций.'
+    )
+
+
+def test_search_is_keyset_paginated(client, blend_post):
+    posts = [blend_post(title=f'Озеро {index}', text='Озеро')
+             for index in range(15)]
+    first, page_obj = found_ids(client, 'озеро')
+    second, second_page = found_ids(client, 'озеро', page_obj.next_cursor)
+    assert len(first) == 10 and not second_page.has_next()
+    assert sorted(first + second) == sorted(post.id for post in posts)
+    back, _ = found_ids(client, 'озеро', second_page.previous_cursor)
+    assert back == first
+
+
+def test_admin_search_uses_index(blend_post):
+    from django.contrib import admin
+
+    from blog.models import Post
+
+    post = blend_post(title='Заголовок', text='Редкое слово в тексте')
+    blend_post(title='Другое', text='Текст')
+    queryset, _ = admin.site._registry[Post].get_search_results(
+        None, Post.objects.all(), 'редкое')
+    assert 'blog_post_fts' in str(queryset.query)
+    assert list(queryset) == [post], (
+        'Убедитесь, что поиск в админке идёт по индексу FTS5.'
+    )
@@ -0,0 +1,28 @@
+import pytest
+from django.db import connection
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='PRAGMA — SQLite'),
+]
+
+
+def pragma(name):
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+def test_connection_gets_selected_profile(settings):
+    from core.sqlite import SQLITE_PROFILES, configure_connection
+
+    settings.SQLITE_PROFILE = 'production'
+    configure_connection(sender=None, connection=connection)
+    profile = SQLITE_PROFILES['production']
+    assert pragma('busy_timeout') == profile['busy_timeout'], (
+        'Убедитесь, что профиль SQLITE_PROFILE применяется к соединению.'
+    )
+    assert pragma('cache_size') == profile['cache_size']
+    assert pragma('synchronous') == 1, 'Ожидался synchronous = NORMAL.'
+    assert pragma('temp_store') == 2, 'Ожидался temp_store = MEMORY.'
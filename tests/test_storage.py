@@ -0,0 +1,63 @@
+import os
+import re
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _upload():
+    data = BytesIO()
+    Image.new('RGB', (30, 20), 'red').save(data, 'PNG')
+    return SimpleUploadedFile(
+        'photo.PNG', data.getvalue(), content_type='image/png')
+
+
+def test_identical_uploads_are_stored_once(
+        mixer, user, django_capture_on_commit_callbacks):
+    from core.models import StoredFile
+
+    posts = mixer.cycle(2).blend('blog.Post', author=user, image=None)
+    for post in posts:
+        post.image = _upload()
+        post.save()
+    first, second = posts
+    assert first.image.name == second.image.name
+    assert re.fullmatch(
+        r'post_images/([0-9a-f]{2})/([0-9a-f]{2})/\1\2[0-9a-f]{60}\.png',
+        first.image.name,
+    ), 'Убедитесь, что файл назван по хешу и разложен по каталогам.'
+    assert StoredFile.objects.get(name=first.image.name).references == 2
+
+    path = first.image.path
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    assert os.path.exists(path), (
+        'Убедитесь, что файл не удаляется, пока на него есть ссылки.'
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        second.delete()
+    assert not os.path.exists(path)
+    assert not StoredFile.objects.filter(name=second.image.name).exists()
+
+
+def test_reuploading_same_image_keeps_one_reference(
+        mixer, user, django_capture_on_commit_callbacks):
+    from core.models import StoredFile
+
+    post = mixer.blend('blog.Post', author=user, image=None)
+    for _ in range(2):
+        post.image = _upload()
+        with django_capture_on_commit_callbacks(execute=True):
+            post.save()
+    assert StoredFile.objects.get(name=post.image.name).references == 1, (
+        'Убедитесь, что повторная загрузка той же картинки '
+        'не оставляет лишней ссылки на файл.'
+    )
+    path = post.image.path
+    with django_capture_on_commit_callbacks(execute=True):
+        post.delete()
+    assert not os.path.exists(path)
@@ -0,0 +1,39 @@
+from io import StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_sweep_removes_only_orphans(
+        settings, tmp_path, post_with_published_location):
+    from core.storage import post_image_storage
+
+    settings.MEDIA_ROOT = tmp_path / 'media'
+    quarantine = tmp_path / 'quarantine'
+    post = post_with_published_location
+    post.image.save('kept.png', ContentFile(b'kept'))
+    orphan = post_image_storage.save('post_images/gone.png',
+                                     ContentFile(b'orphan'))
+    legacy = 'post_images/legacy.jpg'
+    with open(post_image_storage.path(legacy), 'wb') as file:
+        file.write(b'legacy-bytes')
+
+    out = StringIO()
+    call_command('sweep_media', '--min-age=0', '--dry-run', stdout=out)
+    assert post_image_storage.exists(orphan)
+
+    call_command('sweep_media', '--min-age=0',
+                 f'--quarantine={quarantine}', stdout=out)
+    assert post_image_storage.exists(post.image.name), (
+        'Убедитесь, что файлы, на которые ссылаются публикации, остаются.'
+    )
+    for name in (orphan, legacy):
+        assert not post_image_storage.exists(name)
+        assert (quarantine / name).exists(), (
+            'Убедитесь, что файлы без ссылок переносятся в карантин.'
+        )
+    assert out.getvalue().strip().endswith(f'Освобождено: 2 файлов, '
+                                           f'{len(b"orphan") + 12} байт')
@@ -0,0 +1,39 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_category_toggle_updates_visibility(
+        published_category, post_with_published_location):
+    post = post_with_published_location
+    assert post.is_visible
+    published_category.is_published = False
+    published_category.save()
+    post.refresh_from_db()
+    assert not post.is_visible, (
+        'Убедитесь, что снятие категории с публикации скрывает её посты.'
+    )
+    published_category.is_published = True
+    published_category.save()
+    post.refresh_from_db()
+    assert post.is_visible
+
+
+def test_publish_scheduled_opens_due_posts(post_with_published_location):
+    post = post_with_published_location
+    post.pub_date = timezone.now() + timedelta(seconds=1)
+    post.save()
+    assert not post.is_visible
+    type(post).objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(seconds=1))
+    call_command('publish_scheduled', stdout=StringIO())
+    post.refresh_from_db()
+    assert post.is_visible, (
+        'Убедитесь, что команда publish_scheduled открывает публикации,'
+        ' время которых наступило.'
+    )
@@ -0,0 +1,97 @@
+import threading
+
+import pytest
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+@pytest.fixture
+def write_queue(settings):
+    from core.writer import write_queue
+
+    settings.SERIALIZE_WRITES = True
+    yield write_queue
+    write_queue.stop()
+
+
+def test_writes_run_in_one_thread_and_commit(write_queue):
+    from blog.models import Location
+
+    def create(name):
+        if name == 'сбой':
+            Location.objects.create(name=name)
+            raise ValueError(name)
+        return Location.objects.create(name=name).pk, threading.get_ident()
+
+    results, errors = [], []
+
+    def submit(name):
+        try:
+            results.append(write_queue.submit(create, name))
+        except ValueError as error:
+            errors.append(error)
+
+    threads = [
+        threading.Thread(target=submit, args=(name,))
+        for name in ('первая', 'вторая', 'сбой', 'третья')
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 3 and len(errors) == 1, (
+        'Убедитесь, что ошибка одной записи возвращается только её автору.'
+    )
+    assert len({ident for _, ident in results}) == 1, (
+        'Убедитесь, что записи выполняются одним потоком-писателем.'
+    )
+    assert sorted(Location.objects.values_list('name', flat=True)) == [
+        'вторая', 'первая', 'третья'
+    ], 'Убедитесь, что неудавшаяся запись откатывается, а остальные — нет.'
+
+
+def test_comment_goes_through_writer(
+        write_queue, user_client, post_with_published_location):
+    response = user_client.post(
+        f'/posts/{post_with_published_location.id}/comment/',
+        {'text': 'Текст'})
+    assert response.status_code == 302
+    assert post_with_published_location.comment_set.count() == 1
+
+
+def test_writer_reports_writes_to_request(
+        write_queue, user_client, post_with_published_location):
+    response = user_client.post(
+        f'/posts/{post_with_published_location.id}/comment/',
+        {'text': 'Текст'})
+    assert 'primary_reads' in response.cookies, (
+        'Убедитесь, что запись в потоке-писателе привязывает пользователя '
+        'к основной базе.'
+    )
+
+
+def test_connection_error_fails_batch_instead_of_hanging(
+        write_queue, monkeypatch):
+    from core import writer
+
+    def broken():
+        raise RuntimeError('нет соединения')
+
+    monkeypatch.setattr(writer, 'close_old_connections', broken)
+    outcome = []
+
+    def submit():
+        try:
+            write_queue.submit(lambda: None)
+        except RuntimeError as error:
+            outcome.append(error)
+
+    thread = threading.Thread(target=submit)
+    thread.start()
+    thread.join(timeout=5)
+    assert not thread.is_alive() and outcome, (
+        'Убедитесь, что ошибка соединения в потоке-писателе возвращается '
+        'запросам, а не оставляет их ждать.'
+    )
+    monkeypatch.undo()
+    assert write_queue.submit(lambda: 'ок') == 'ок'